@@ -2,11 +2,24 @@
 
 import streamlit as st
 
+from utils import warmup
+
 # Set page config
 st.set_page_config(page_title="Canadian Election Dashboard", layout="wide")
 
 st.title("🇨🇦 Canadian Election Dashboard: Shaping Insights Through Data")
 
+# Warm data, aggregates, models and the map in the background (once per server process)
+warmup_status = warmup.start()
+
+if not warmup_status.ready:
+    st.info(f"⏳ Warming up: {warmup_status.current or 'starting'}… ({len(warmup_status.done)}/{len(warmup.STEPS)} ready)")
+    st.progress(len(warmup_status.done) / len(warmup.STEPS))
+elif warmup_status.failed:
+    st.warning("⚠️ Dashboard ready, but some caches could not be prepared: " + ", ".join(warmup_status.failed))
+else:
+    st.success(f"✅ Dashboard ready — caches warmed in {warmup_status.finished - warmup_status.started:.0f}s.")
+
 st.markdown("""
 Welcome to the **Interactive Canadian Election Dashboard**! 🎉✨
 
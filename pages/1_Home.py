@@ -4,25 +4,13 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 
-@st.cache_data
-def load_data():
-    df = pd.read_csv('data/Election_Data.csv', encoding='latin1')
-    df.columns = df.columns.str.strip()
-
-    # Parse numeric components of date
-    df['Year'] = pd.to_numeric(df['Year'], errors='coerce')
-    df['Month'] = pd.to_numeric(df['Month'], errors='coerce')
-    df['Day'] = pd.to_numeric(df['Day'], errors='coerce')
-
-    # Build ParsedDate from components
-    df['ParsedDate'] = pd.to_datetime(dict(year=df['Year'], month=df['Month'], day=df['Day']), errors='coerce')
-    df = df.dropna(subset=['ParsedDate'])
-    df['Year'] = df['ParsedDate'].dt.year.astype(int)
-
-    return df
+from utils import query
+from utils.data import election_view
+from utils.tables import paged_table
+from utils.topk import top_categories, top_rows
 
 # Load and prepare data
-df = load_data()
+df = election_view('home')
 
 # Sidebar filters
 st.sidebar.header("🔍 Filter Overview")
@@ -31,7 +19,7 @@ selected_provinces = st.sidebar.multiselect("Province/Territory", sorted(df['Pro
 selected_parties = st.sidebar.multiselect("Political Affiliation", sorted(df['Political_Affiliation'].dropna().unique()))
 selected_years = st.sidebar.multiselect("Election Year", sorted(df['Year'].dropna().unique()))
 
-df_filtered = df.copy()
+df_filtered = df
 if selected_provinces:
     df_filtered = df_filtered[df_filtered['Province_Territory'].isin(selected_provinces)]
 if selected_parties:
@@ -39,6 +27,8 @@ if selected_parties:
 if selected_years:
     df_filtered = df_filtered[df_filtered['Year'].isin(selected_years)]
 
+filters = dict(provinces=selected_provinces, parties=selected_parties, years=selected_years)
+
 # ---------------------------------------
 # Page Title & Intro
 # ---------------------------------------
@@ -85,48 +75,11 @@ st.divider()
 # ---------------------------------------
 st.header("🥇 Winning Party by Riding and Parliament")
 
-# Filter to elected candidates only
-winners = df_filtered[df_filtered['Result'].str.contains("Elected", na=False)]
-
-# Sum votes by Constituency within each Parliament & Province
-summary = (
-    winners.groupby(['Parliament', 'Province_Territory', 'Constituency', 'Political_Affiliation'])['Votes']
-    .sum()
-    .reset_index()
-)
-
-# Rank within each riding
-summary['Rank'] = summary.groupby(['Parliament', 'Province_Territory', 'Constituency'])['Votes'] \
-                         .rank(ascending=False, method='first')
-
-# Keep only top-ranked (winning) party per riding
-winners_only = summary[summary['Rank'] == 1].drop(columns='Rank')
-
-# Total votes per riding (regardless of party)
-total_votes = (
-    df_filtered.groupby(['Parliament', 'Province_Territory', 'Constituency'])['Votes']
-    .sum()
-    .reset_index()
-    .rename(columns={'Votes': 'TotalVotes'})
-)
-
-# Merge to calculate vote share
-winners_only = winners_only.merge(total_votes, on=['Parliament', 'Province_Territory', 'Constituency'])
-winners_only['Vote Share (%)'] = (winners_only['Votes'] / winners_only['TotalVotes']) * 100
-winners_only['Vote Share (%)'] = winners_only['Vote Share (%)'].round(2)
-
-# Rename and reorder columns
-winners_only = winners_only.rename(columns={
-    'Province_Territory': 'Province',
-    'Constituency': 'Constituency',
-    'Political_Affiliation': 'Winning Party',
-    'Votes': 'Votes Won'
-})
+# Top-voted elected party per riding, with its share of the riding's total votes
+winners_only = query.aggregate('home', 'riding_winners', filters)
 
-winners_only = winners_only[['Parliament', 'Province', 'Constituency', 'Winning Party', 'Votes Won', 'Vote Share (%)']]
-
-# Display
-st.dataframe(winners_only.sort_values(['Parliament', 'Province', 'Constituency']), use_container_width=True)
+# Display (groupby output is already ordered by Parliament, Province, Constituency)
+paged_table(winners_only, key="winners_only")
 
 # ---------------------------------------
 # Political Party Spectrum
@@ -163,22 +116,11 @@ st.divider()
 # -------------------------------
 st.header("💼 Top 10 Candidate Occupations")
 
-# Clean and categorize
-df_filtered['Result_Clean'] = df_filtered['Result'].fillna("Unknown").str.contains("Elected", case=False)
-
-# Group and count
-occ_counts = (
-    df_filtered.groupby(['Result_Clean', 'Occupation'])
-    .size()
-    .reset_index(name='Count')
-)
+# Count candidates by elected / not elected and occupation
+occ_counts = query.aggregate('home', 'occupation_counts', filters)
 
 # Get top 10 for each group
-top_occ = (
-    occ_counts.groupby('Result_Clean')
-    .apply(lambda x: x.sort_values('Count', ascending=False).head(10))
-    .reset_index(drop=True)
-)
+top_occ = top_rows(occ_counts, 'Count', 10, group_col='Result_Clean')
 
 fig_occ = px.bar(
     top_occ,
@@ -202,14 +144,8 @@ st.divider()
 st.header("🔤 Most Common Candidate Names")
 
 # First Names
-first_names = (
-    df_filtered['First_Name']
-    .dropna()
-    .str.title()
-    .value_counts()
-    .head(10)
-    .reset_index()
-)
+# Names are title-cased and integer-coded once at load (utils/data.py)
+first_names = top_categories(df_filtered['First_Name_Clean'], 10)
 first_names.columns = ['First Name', 'Count']
 
 fig_first = px.bar(
@@ -222,14 +158,7 @@ fig_first = px.bar(
 fig_first.update_layout(yaxis=dict(categoryorder='total ascending'))
 
 # Last Names
-last_names = (
-    df_filtered['Last_Name']
-    .dropna()
-    .str.title()
-    .value_counts()
-    .head(10)
-    .reset_index()
-)
+last_names = top_categories(df_filtered['Last_Name_Clean'], 10)
 last_names.columns = ['Last Name', 'Count']
 
 fig_last = px.bar(
@@ -1,32 +1,20 @@
 # pages/2_Advanced_Analytics.py
 
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 import numpy as np
 import calendar
 
+from utils import charts
+from utils import query
+from utils.data import election_view
+from utils.tables import paged_table
+from utils.topk import top_rows
+
 # -------------------------------
 # Load data
 # -------------------------------
-@st.cache_data
-def load_data():
-    df = pd.read_csv('data/Election_Data.csv', encoding='latin1')
-    df.columns = df.columns.str.strip()
-
-    # Parse dates
-    df['Year'] = pd.to_numeric(df['Year'], errors='coerce')
-    df['Month'] = pd.to_numeric(df['Month'], errors='coerce')
-    df['Day'] = pd.to_numeric(df['Day'], errors='coerce')
-    df['Date'] = pd.to_datetime(dict(year=df['Year'], month=df['Month'], day=df['Day']), errors='coerce')
-    df['Weekday'] = df['Date'].dt.day_name()
-
-    # Filter out rows with missing key fields
-    df = df.dropna(subset=['Year', 'Province_Territory', 'Election_Type', 'Parliament', 'Constituency', 'Votes'])
-    df['Votes'] = pd.to_numeric(df['Votes'], errors='coerce').fillna(0).astype(int)
-    return df
-
-df = load_data()
+df = election_view('analytics')
 
 # -------------------------------
 # Page Configuration
@@ -54,39 +42,30 @@ df = df[df['Election_Type'] == selected_type]
 df = df[df['Political_Affiliation'].isin(selected_parties)]
 df = df[df['Constituency'].isin(selected_constituencies)]
 
+filters = dict(election_type=selected_type, parties=selected_parties, constituencies=selected_constituencies)
+
 # -------------------------------
 # Turnout and Participation Over Time
 # -------------------------------
 st.header("📈 Turnout and Participation Over Time")
-turnout = df.groupby('Year').agg({
-    'Votes': 'sum',
-    'Constituency': 'nunique',
-    'Province_Territory': 'nunique'
-}).rename(columns={
-    'Votes': 'Total Votes',
-    'Constituency': 'Total Ridings',
-    'Province_Territory': 'Provinces Participating'
-}).reset_index()
-
-fig_turnout = px.line(turnout, x='Year', y='Total Votes', markers=True, title='Total Votes Cast Over Time')
+turnout = query.aggregate('analytics', 'turnout', filters)
+
+fig_turnout = px.line(charts.downsample(turnout, 'Year', 'Total Votes'), x='Year', y='Total Votes', markers=True, title='Total Votes Cast Over Time')
 st.plotly_chart(fig_turnout, use_container_width=True)
 
 # -------------------------------
 # Votes by Province Over Time
 # -------------------------------
 st.header("🗺️ Vote Totals by Province")
-prov_vote = df.groupby(['Year', 'Province_Territory'])['Votes'].sum().reset_index()
-fig_prov = px.line(prov_vote, x='Year', y='Votes', color='Province_Territory', title="Votes by Province")
+prov_vote = query.aggregate('analytics', 'province_totals', filters)
+fig_prov = px.line(charts.downsample(prov_vote, 'Year', 'Votes', color='Province_Territory'), x='Year', y='Votes', color='Province_Territory', title="Votes by Province")
 st.plotly_chart(fig_prov, use_container_width=True)
 
 # -------------------------------
 # Vote Share by Party
 # -------------------------------
 st.header("🧮 Party Vote Share Over Time")
-party_share = df.groupby(['Year', 'Political_Affiliation'])['Votes'].sum().reset_index()
-total_by_year = party_share.groupby('Year')['Votes'].sum().reset_index().rename(columns={'Votes': 'YearTotal'})
-party_share = party_share.merge(total_by_year, on='Year')
-party_share['Vote Share %'] = (party_share['Votes'] / party_share['YearTotal']) * 100
+party_share = query.aggregate('analytics', 'party_vote_share', filters)
 
 fig_share = px.area(party_share, x='Year', y='Vote Share %', color='Political_Affiliation', title="Party Vote Share Over Time")
 st.plotly_chart(fig_share, use_container_width=True)
@@ -101,7 +80,7 @@ margins = df.groupby(['Year', 'Province_Territory', 'Constituency']).apply(
 ).reset_index(drop=True)
 
 margin_calc = margins.groupby(['Year', 'Province_Territory', 'Constituency'])['Votes'].apply(lambda x: x.iloc[0] - x.iloc[1] if len(x) > 1 else 0).reset_index(name='Winning Margin')
-fig_margin = px.box(margin_calc, x='Year', y='Winning Margin', title="Distribution of Winning Margins")
+fig_margin = charts.box(margin_calc, x='Year', y='Winning Margin', title="Distribution of Winning Margins")
 st.plotly_chart(fig_margin, use_container_width=True)
 
 # -------------------------------
@@ -115,7 +94,7 @@ close_races['Total Votes'] = close_races.groupby(['Year', 'Constituency'])['Vote
 close_races['Margin %'] = (close_races['Vote Diff'] / close_races['Total Votes']) * 100
 
 close_summary = close_races[(close_races['Margin %'] < 5) & (close_races['Margin %'].notna())]
-st.dataframe(close_summary[['Year', 'Constituency', 'Political_Affiliation', 'Votes', 'Margin %']].sort_values('Margin %'), use_container_width=True)
+paged_table(close_summary[['Year', 'Constituency', 'Political_Affiliation', 'Votes', 'Margin %']], key="close_summary", default_sort='Margin %')
 
 # -------------------------------
 # Spoiler Candidates
@@ -127,7 +106,7 @@ spoilers['Rank'] = spoilers.groupby(['Year', 'Constituency'])['Votes'].rank(asce
 thirds = spoilers[spoilers['Rank'] == 3]
 thirds = thirds[thirds['Votes'] > 0]
 
-fig_third = px.histogram(thirds, x='Votes', nbins=30, title="Votes Received by 3rd Place Candidates")
+fig_third = charts.histogram(thirds['Votes'], nbins=30, title="Votes Received by 3rd Place Candidates", x_title='Votes')
 st.plotly_chart(fig_third, use_container_width=True)
 
 # -------------------------------
@@ -167,8 +146,8 @@ st.plotly_chart(fig_weekday, use_container_width=True)
 st.header("🔁 Ridings with Consistent Party Wins")
 winner_df = df[df['Result'].str.contains("Elected", na=False)]
 riding_dominance = winner_df.groupby(['Constituency', 'Political_Affiliation'])['Year'].nunique().reset_index(name='Win_Years')
-top_ridings = riding_dominance.sort_values(['Constituency', 'Win_Years'], ascending=[True, False])
-top_ridings = top_ridings.groupby('Constituency').head(1).sort_values('Win_Years', ascending=False).head(20)
+top_ridings = top_rows(riding_dominance, 'Win_Years', 1, group_col='Constituency')
+top_ridings = top_rows(top_ridings, 'Win_Years', 20)
 st.dataframe(top_ridings, use_container_width=True)
 
 # -------------------------------
@@ -176,18 +155,15 @@ st.dataframe(top_ridings, use_container_width=True)
 # -------------------------------
 st.header("🗺️ Riding Lifespan Map")
 riding_years = df.groupby('Constituency')['Year'].agg(['min', 'max']).reset_index().rename(columns={'min': 'First Appearance', 'max': 'Last Appearance'})
-st.dataframe(riding_years.sort_values('First Appearance'), use_container_width=True)
+paged_table(riding_years, key="riding_years", default_sort='First Appearance')
 
 # -------------------------------
 # 👔 Occupation vs Vote Share
 # -------------------------------
 st.header("👔 Occupation Influence on Vote Share")
 
-# Calculate relative performance within each riding/year
-df['Total_Riding_Votes'] = df.groupby(['Year', 'Constituency'])['Votes'].transform('sum')
-df['Vote_Share'] = (df['Votes'] / df['Total_Riding_Votes']) * 100
-
-occ_vote_share = df.groupby('Occupation')['Vote_Share'].mean().reset_index().dropna().sort_values('Vote_Share', ascending=False).head(15)
+# Mean of each candidate's share of their riding/year total
+occ_vote_share = query.aggregate('analytics', 'occupation_vote_share', filters, limit=15)
 fig_occ_perf = px.bar(occ_vote_share, x='Vote_Share', y='Occupation', orientation='h', title="Avg Vote Share by Occupation")
 st.plotly_chart(fig_occ_perf, use_container_width=True)
 
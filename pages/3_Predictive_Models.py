@@ -4,31 +4,8 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder
-from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.metrics import accuracy_score, classification_report, r2_score
 
-# -------------------------------
-# Load Data
-# -------------------------------
-@st.cache_data
-def load_data():
-    df = pd.read_csv('data/Election_Data.csv', encoding='latin1')
-    df.columns = df.columns.str.strip()
-
-    # Parse dates
-    df['Year'] = pd.to_numeric(df['Year'], errors='coerce')
-    df['Month'] = pd.to_numeric(df['Month'], errors='coerce')
-    df['Day'] = pd.to_numeric(df['Day'], errors='coerce')
-    df['Date'] = pd.to_datetime(dict(year=df['Year'], month=df['Month'], day=df['Day']), errors='coerce')
-
-    df = df.dropna(subset=['Year', 'Province_Territory', 'Election_Type', 'Parliament', 'Constituency', 'Votes'])
-    df['Votes'] = pd.to_numeric(df['Votes'], errors='coerce').fillna(0).astype(int)
-    return df
-
-df = load_data()
+from utils import explain, forecasting, models, tuning
 
 # -------------------------------
 # Page Configuration
@@ -40,22 +17,8 @@ st.caption("Training predictive models to forecast election outcomes for 2025 ba
 # Data Preparation
 # -------------------------------
 
-# Define target
-df['Win'] = df['Result'].str.contains('Elected', case=False, na=False).astype(int)
-
-# Select features
-features = ['Province_Territory', 'Political_Affiliation', 'Gender', 'Occupation']
-df = df.dropna(subset=features)
-
-# Encode Categorical Variables
-encoder = LabelEncoder()
-for col in features:
-    df[col] = encoder.fit_transform(df[col].astype(str))
-
-# Prepare data
-X = df[['Year'] + features]
-y_class = df['Win']
-y_reg = df['Votes']
+# Encoded features and targets ('Win', 'Votes'), prepared once per process
+X, y_class, y_reg = models.training_data()
 
 # Train on data before 2025
 X_train = X[X['Year'] < 2025]
@@ -70,52 +33,35 @@ y_test_reg = y_reg[X['Year'] == 2025]
 # -------------------------------
 st.header("📈 Logistic Regression: Predict Win vs Loss")
 
-if not X_test.empty and not X_train.empty:
-    log_model = LogisticRegression(max_iter=1000)
-    log_model.fit(X_train, y_train_class)
-    y_pred_class = log_model.predict(X_test)
-
-    accuracy = accuracy_score(y_test_class, y_pred_class)
+classifier = models.logistic_model()
 
-    st.metric(label="Accuracy on 2025 Data", value=f"{accuracy:.2%}")
-
-    st.subheader("Classification Report")
-    st.text(classification_report(y_test_class, y_pred_class, zero_division=0))
-
-elif X_train.empty:
+if classifier is None:
     st.warning("🚨 Not enough training data after applying filters. Please broaden your filters.")
 else:
-    # No 2025 data — fallback to last year
-    last_year = X['Year'].max()
-    st.warning(f"⚠️ No 2025 data available after filtering. Predicting for {last_year} instead.")
-
-    # Fallback dataset
-    X_fallback = X[X['Year'] == last_year]
-    y_fallback = y_class[X['Year'] == last_year]
+    from sklearn.metrics import accuracy_score, classification_report
 
-    # Split fallback set into train/test
-    X_fallback_train, X_fallback_test, y_fallback_train, y_fallback_test = train_test_split(
-        X_fallback, y_fallback, test_size=0.3, random_state=42
-    )
+    eval_year = classifier['eval_year']
+    if eval_year != 2025:
+        # No 2025 data — the model was fit and scored on a split of the last year
+        st.warning(f"⚠️ No 2025 data available after filtering. Predicting for {eval_year} instead.")
 
-    log_model = LogisticRegression(max_iter=1000)
-    log_model.fit(X_fallback_train, y_fallback_train)
-    y_pred_fallback = log_model.predict(X_fallback_test)
+    y_pred_class = classifier['model'].predict(classifier['X_eval'])
 
-    accuracy = accuracy_score(y_fallback_test, y_pred_fallback)
+    accuracy = accuracy_score(classifier['y_eval'], y_pred_class)
 
-    st.metric(label=f"Accuracy on {last_year} Data", value=f"{accuracy:.2%}")
+    st.metric(label=f"Accuracy on {eval_year} Data", value=f"{accuracy:.2%}")
 
     st.subheader("Classification Report")
-    st.text(classification_report(y_fallback_test, y_pred_fallback, zero_division=0))
+    st.text(classification_report(classifier['y_eval'], y_pred_class, zero_division=0))
 
 # -------------------------------
 # Random Forest Model
 # -------------------------------
 st.header("🌳 Random Forest: Predict Vote Share")
 
-rf_model = RandomForestRegressor(n_estimators=100, random_state=42)
-rf_model.fit(X_train, y_train_reg)
+from sklearn.metrics import r2_score
+
+rf_model = models.random_forest_model()
 y_pred_reg = rf_model.predict(X_test)
 
 r2 = r2_score(y_test_reg, y_pred_reg)
@@ -131,6 +77,40 @@ fig_importance = px.bar(
 )
 st.plotly_chart(fig_importance, use_container_width=True)
 
+# -------------------------------
+# 🧠 Model Explanations
+# -------------------------------
+st.header("🧠 Model Explanations")
+st.caption("Permutation importance is the drop in each model's score when a feature is shuffled, which is not biased toward high-cardinality codes like Occupation. Partial dependence shows the average prediction across a feature's values, or for each of its most common categories. Both are precomputed on a sample of rows the model was not trained on: 2025, or a held-out split of the latest year when there is no 2025 data.")
+
+explained = explain.explanations()
+selected_model = st.selectbox("Select Model", list(explained))
+
+perm_importance = explained[selected_model]['permutation_importance']
+fig_perm = px.bar(
+    perm_importance.sort_values('Importance', ascending=True),
+    x='Importance', y='Feature', error_x='Std',
+    orientation='h',
+    title=f"Permutation Importance ({selected_model})"
+)
+st.plotly_chart(fig_perm, use_container_width=True)
+
+partial = explained[selected_model]['partial_dependence']
+selected_feature = st.selectbox("Partial Dependence Feature", list(partial['Feature'].unique()))
+dependence = partial[partial['Feature'] == selected_feature]
+partial_title = f"Partial Dependence on {selected_feature} ({selected_model})"
+partial_labels = {'Value': selected_feature, 'Average': 'Average Prediction'}
+if selected_feature in models.FEATURES:
+    # Categories have no order, so draw one bar per category rather than a line through them
+    fig_partial = px.bar(
+        dependence.sort_values('Average', ascending=True),
+        x='Average', y='Value', orientation='h',
+        title=partial_title, labels=partial_labels
+    )
+else:
+    fig_partial = px.line(dependence, x='Value', y='Average', markers=True, title=partial_title, labels=partial_labels)
+st.plotly_chart(fig_partial, use_container_width=True)
+
 # -------------------------------
 # Predicted vs Actual for 2025
 # -------------------------------
@@ -145,6 +125,77 @@ comparison = pd.DataFrame({
 
 st.dataframe(comparison, use_container_width=True)
 
+# -------------------------------
+# 📉 Riding Vote-Share Forecasts
+# -------------------------------
+st.header("📉 Riding Vote-Share Forecasts")
+st.caption("Damped-trend exponential smoothing fitted to every riding and party's General-election vote share. Forecasts are precomputed and cached until the data changes.")
+
+forecasts = forecasting.riding_forecasts()
+
+if forecasts.empty:
+    st.warning(f"🚨 No riding has at least {forecasting.MIN_OBSERVATIONS} General elections of history to forecast from.")
+else:
+    selected_riding = st.selectbox("Select Riding", sorted(forecasts['Constituency'].unique()))
+
+    series = forecasting.vote_share_series()
+    history = series[series['Constituency'] == selected_riding]
+    last_election = int(history['Year'].max())
+    # Only parties that contested the riding's last election are forecast for the next one
+    riding_forecast = forecasts[(forecasts['Constituency'] == selected_riding) & (forecasts['Last_Year'] == last_election)]
+
+    # Plot the forecast one typical four-year cycle after the riding's last election
+    next_year = last_election + 4
+
+    fig_forecast = px.line(
+        history, x='Year', y='Vote_Share', color='Political_Affiliation', markers=True,
+        title=f"Vote Share History and Next-Election Forecast – {selected_riding}",
+        labels={'Vote_Share': 'Vote Share (%)', 'Political_Affiliation': 'Party'}
+    )
+    fig_forecast.add_scatter(
+        x=[next_year] * len(riding_forecast),
+        y=riding_forecast['Forecast'],
+        error_y=dict(
+            type='data', symmetric=False,
+            array=riding_forecast['Upper'] - riding_forecast['Forecast'],
+            arrayminus=riding_forecast['Forecast'] - riding_forecast['Lower']
+        ),
+        mode='markers', marker=dict(symbol='diamond', size=10, color='black'),
+        text=riding_forecast['Political_Affiliation'], name='Forecast (80% interval)'
+    )
+    st.plotly_chart(fig_forecast, use_container_width=True)
+
+    if riding_forecast.empty:
+        st.info(f"No party in the riding's {last_election} election has {forecasting.MIN_OBSERVATIONS} General elections of history to forecast from.")
+    else:
+        st.dataframe(
+            riding_forecast[['Political_Affiliation', 'Last_Year', 'Last_Share', 'Forecast', 'Lower', 'Upper', 'Observations']]
+            .sort_values('Forecast', ascending=False).round(2),
+            use_container_width=True, hide_index=True
+        )
+
+# -------------------------------
+# ⚙️ Model Configuration
+# -------------------------------
+st.header("⚙️ Model Configuration")
+
+# Tuned configurations the models on this page are fitted with; the rest have no consumer yet
+fitted_models = {'logistic_regression', 'random_forest'}
+
+tuned = tuning.best_params()
+if tuned:
+    st.caption("Best configurations from the last offline successive-halving search, scored on time-aware validation folds. Logistic Regression and Random Forest above are fitted with these; models marked \"Not yet\" (XGBoost) are tuned ahead of their release and nothing uses them so far.")
+    st.dataframe(
+        pd.DataFrame([
+            {'Model': name, 'Used on This Page': 'Yes' if name in fitted_models else 'Not yet',
+             'Metric': result['scoring'], 'Validation Score': round(result['score'], 4), 'Parameters': str(result['params'])}
+            for name, result in tuned.items()
+        ]),
+        use_container_width=True, hide_index=True
+    )
+else:
+    st.caption("Models use default hyperparameters. Run `python -m utils.tuning` to search for better ones.")
+
 # -------------------------------
 # 🚀 Future Enhancements
 # -------------------------------
@@ -152,7 +203,6 @@ st.header("🚀 Coming Soon: Advanced Predictive Models")
 
 st.info(
     "- XGBoost Classification and Regression\n"
-    "- ARIMA Time-Series Forecasting\n"
     "- Integration with Demographic and Geographic Datasets\n"
     "- More advanced machine learning pipelines"
 )
@@ -0,0 +1,355 @@
+# utils/api.py
+
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import streamlit as st
+
+from utils import ingest, models, query
+from utils.data import election_view, fingerprint, load_election_data
+
+# -------------------------------
+# Read-only data API
+# -------------------------------
+# Serves the numbers the dashboard computes to other local tools, so they do
+# not have to scrape the pages or re-derive them:
+#
+#   python -m utils.api --port 8600
+#
+#   GET /races                      winner, runner-up and margin per race
+#   GET /rollups                    totals per election year and type
+#   GET /aggregates/<name>          any page aggregate in utils/query.py
+#   GET /predictions                model win probability and votes per candidate
+#   GET /forecasts                  next-election vote share per riding and party
+#   GET /health
+#
+# Filters are query parameters (?year=2019,2021&party=Green%20Party); a
+# parameter may be repeated or comma-separated. Responses are JSON records,
+# or Arrow IPC streams with ?format=arrow (or an Accept header asking for
+# ARROW_MIME). Bodies are gzipped when the client accepts it, and every
+# response carries an ETag built from the data fingerprint, so an
+# If-None-Match revalidation returns 304 without recomputing anything.
+# Requests are handled on a fixed-size thread pool; the data, models and
+# aggregates are the same process-wide caches the pages use.
+
+ARROW_MIME = 'application/vnd.apache.arrow.stream'
+JSON_MIME = 'application/json'
+
+DEFAULT_PORT = 8600
+DEFAULT_WORKERS = 8
+# Smaller bodies are not worth compressing
+GZIP_MIN_BYTES = 1024
+
+# Query parameter → column, per frame the parameter can filter
+FILTER_COLUMNS = {
+    'year': 'Year',
+    'province': 'Province_Territory',
+    'party': 'Political_Affiliation',
+    'constituency': 'Constituency',
+    'election_type': 'Election_Type',
+}
+
+# Query parameter → utils.query filter key
+AGGREGATE_FILTERS = {
+    'year': 'years',
+    'province': 'provinces',
+    'party': 'parties',
+    'constituency': 'constituencies',
+    'election_type': 'election_type',
+}
+
+# Aggregate → page scope it is computed over, as on the pages
+AGGREGATES = {
+    'riding_winners': 'home',
+    'occupation_counts': 'home',
+    'turnout': 'analytics',
+    'province_totals': 'analytics',
+    'party_vote_share': 'analytics',
+    'occupation_vote_share': 'analytics',
+}
+
+
+class BadRequest(ValueError):
+    pass
+
+
+class NotFound(LookupError):
+    pass
+
+
+# -------------------------------
+# Datasets
+# -------------------------------
+@st.cache_resource(show_spinner=False)
+def data_fingerprint():
+    """Fingerprint of the loaded election data; ETags change exactly when it does."""
+    return fingerprint(load_election_data())
+
+
+@st.cache_resource(show_spinner=False)
+def race_summaries():
+    # The partition store already holds them when it is up to date with the CSV
+    if ingest.partitions_current():
+        return ingest.load_race_summaries()
+    return ingest.race_summary(election_view('analytics'))
+
+
+@st.cache_resource(show_spinner=False)
+def yearly_rollups():
+    if ingest.partitions_current():
+        return ingest.load_yearly_rollups()
+    return ingest.yearly_rollup(election_view('analytics'))
+
+
+@st.cache_resource(show_spinner=False)
+def predictions():
+    """(version, rows): win probability and predicted votes for every candidate row the models can score.
+
+    The version is taken from the fitted models themselves, so it always
+    describes the rows next to it, even if the tuned parameters on disk
+    have changed since the models were loaded.
+    """
+    X, y_class, y_reg = models.training_data()
+    rows = election_view('analytics').loc[X.index, ['Year', 'Province_Territory', 'Constituency',
+                                                    'Political_Affiliation', 'Candidate']]
+    rows['Won'] = y_class
+    rows['Votes'] = y_reg
+
+    classifier = models.logistic_model()
+    regressor = models.random_forest_model()
+    fitted = [regressor.get_params()]
+    if classifier is not None:
+        rows['Win_Probability'] = classifier['model'].predict_proba(X)[:, 1]
+        fitted.append(classifier['model'].get_params())
+    rows['Predicted_Votes'] = regressor.predict(X)
+
+    params = hashlib.sha1(json.dumps(fitted, sort_keys=True, default=str).encode()).hexdigest()[:8]
+    version = f"{models.training_fingerprint()}-{params}"
+    return version, rows.reset_index(drop=True)
+
+
+def _forecasts():
+    from utils import forecasting
+
+    return forecasting.riding_forecasts()
+
+
+# -------------------------------
+# Request handling
+# -------------------------------
+def _values(params, name):
+    return [v.strip() for raw in params.get(name, []) for v in raw.split(',') if v.strip()]
+
+
+def _years(values):
+    try:
+        return [int(v) for v in values]
+    except ValueError:
+        raise BadRequest(f"year must be an integer, got {values}")
+
+
+def _filter_frame(df, params, columns):
+    for name, values in params.items():
+        col = columns.get(name)
+        if col is None or col not in df.columns:
+            raise BadRequest(f"Unsupported filter for this endpoint: {name}")
+        values = _years(values) if name == 'year' else values
+        df = df[df[col].isin(values)]
+    return df
+
+
+def _frame_params(params):
+    return {name: _values(params, name) for name in params if name not in ('format', 'limit')}
+
+
+def _aggregate(name, params):
+    if name not in AGGREGATES:
+        raise NotFound(f"Unknown aggregate: {name}. Available: {', '.join(AGGREGATES)}")
+    filters = {}
+    for param, values in _frame_params(params).items():
+        key = AGGREGATE_FILTERS.get(param)
+        if key is None:
+            raise BadRequest(f"Unsupported filter for aggregates: {param}")
+        if key == 'election_type':
+            if len(values) != 1:
+                raise BadRequest("election_type takes a single value")
+            filters[key] = values[0]
+        else:
+            filters[key] = _years(values) if param == 'year' else values
+
+    kwargs = {}
+    if 'limit' in params:
+        if name != 'occupation_vote_share':
+            raise BadRequest("limit only applies to occupation_vote_share")
+        try:
+            kwargs['limit'] = int(_values(params, 'limit')[0])
+        except (IndexError, ValueError):
+            raise BadRequest("limit must be an integer")
+    return query.aggregate(AGGREGATES[name], name, filters, **kwargs)
+
+
+def resolve(path, params):
+    """The frame for a request path and its parsed query parameters."""
+    parts = [p for p in path.split('/') if p]
+    frame_params = _frame_params(params)
+
+    if parts == ['races']:
+        return _filter_frame(race_summaries(), frame_params, {**FILTER_COLUMNS, 'party': 'Winning_Party'})
+    if parts == ['rollups']:
+        return _filter_frame(yearly_rollups(), frame_params, FILTER_COLUMNS)
+    if parts == ['predictions']:
+        return _filter_frame(predictions()[1], frame_params, FILTER_COLUMNS)
+    if parts == ['forecasts']:
+        return _filter_frame(_forecasts(), frame_params, FILTER_COLUMNS)
+    if len(parts) == 2 and parts[0] == 'aggregates':
+        return _aggregate(parts[1], params)
+    raise NotFound(f"No such endpoint: {path}")
+
+
+def _etag(path, params, fmt):
+    # Same data, same request, same format → same body
+    key = json.dumps([path, sorted((k, sorted(v)) for k, v in params.items()), fmt])
+    version = data_fingerprint()
+    if path.strip('/') == 'predictions':
+        # Retuned parameters change predictions without changing the data; the
+        # version comes from the same cached models that produce the body
+        version = predictions()[0]
+    return f'W/"{version}-{hashlib.sha1(key.encode()).hexdigest()[:12]}"'
+
+
+def encode(df, fmt):
+    if fmt == 'arrow':
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        sink = io.BytesIO()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue()
+    return df.to_json(orient='records', date_format='iso').encode()
+
+
+@lru_cache(maxsize=128)
+def _render(etag, path, query_string, fmt):
+    # Keyed on the ETag, so a cached body is only reused for the data it was built from
+    body = encode(resolve(path, parse_qs(query_string)), fmt)
+    return body, gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_BYTES else None
+
+
+class Handler(BaseHTTPRequestHandler):
+    server_version = 'ElectionAPI/1.0'
+    protocol_version = 'HTTP/1.1'
+    # Idle keep-alive connections give their worker back after this many seconds
+    timeout = 30
+
+    def _format(self, params):
+        fmt = (params.get('format') or [''])[0].lower()
+        if not fmt:
+            fmt = 'arrow' if ARROW_MIME in self.headers.get('Accept', '') else 'json'
+        if fmt not in ('json', 'arrow'):
+            raise BadRequest(f"format must be json or arrow, got {fmt}")
+        return fmt
+
+    def _send(self, status, body=b'', content_type=JSON_MIME, headers=None, include_body=True):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if status != HTTPStatus.NOT_MODIFIED:
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if include_body and status != HTTPStatus.NOT_MODIFIED:
+            self.wfile.write(body)
+
+    def _error(self, status, message, include_body=True):
+        self._send(status, json.dumps({'error': message}).encode(), include_body=include_body)
+
+    def _serve(self, include_body):
+        url = urlsplit(self.path)
+        params = parse_qs(url.query)
+
+        if url.path.strip('/') == 'health':
+            body = json.dumps({'status': 'ok', 'fingerprint': data_fingerprint()}).encode()
+            return self._send(HTTPStatus.OK, body, include_body=include_body)
+
+        try:
+            fmt = self._format(params)
+            etag = _etag(url.path, params, fmt)
+            headers = {'ETag': etag, 'Cache-Control': 'no-cache', 'Vary': 'Accept, Accept-Encoding'}
+            if etag in [tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')]:
+                return self._send(HTTPStatus.NOT_MODIFIED, headers=headers, include_body=include_body)
+
+            body, compressed = _render(etag, url.path, url.query, fmt)
+        except BadRequest as e:
+            return self._error(HTTPStatus.BAD_REQUEST, str(e), include_body)
+        except NotFound as e:
+            return self._error(HTTPStatus.NOT_FOUND, str(e), include_body)
+        except Exception:
+            self.log_error("%s", traceback.format_exc())
+            return self._error(HTTPStatus.INTERNAL_SERVER_ERROR, "Internal error", include_body)
+
+        if compressed is not None and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = compressed
+            headers['Content-Encoding'] = 'gzip'
+        self._send(HTTPStatus.OK, body, ARROW_MIME if fmt == 'arrow' else JSON_MIME, headers, include_body)
+
+    def do_GET(self):
+        self._serve(include_body=True)
+
+    def do_HEAD(self):
+        self._serve(include_body=False)
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTPServer that handles connections on a fixed-size thread pool."""
+
+    def __init__(self, address, handler, workers=DEFAULT_WORKERS):
+        super().__init__(address, handler)
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='election-api')
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+
+def serve(host='127.0.0.1', port=DEFAULT_PORT, workers=DEFAULT_WORKERS):
+    # Load the data before accepting connections so the first requests do not all wait on it
+    print(f"📦 Election data loaded (fingerprint {data_fingerprint()})")
+    server = PooledHTTPServer((host, port), Handler, workers=workers)
+    print(f"✅ Serving on http://{host}:{port} with {workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serve dashboard aggregates as JSON or Arrow over local HTTP.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    args = parser.parse_args()
+
+    serve(args.host, args.port, args.workers)
@@ -0,0 +1,122 @@
+# utils/charts.py
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# -------------------------------
+# Server-side chart aggregation
+# -------------------------------
+# Plotly Express serializes every raw row into the figure JSON. These helpers
+# reduce the data with NumPy first so figure payloads stay bounded by the
+# number of bins / groups / points, not by the size of the dataset.
+
+MAX_OUTLIERS_PER_GROUP = 50
+MAX_POINTS_PER_SERIES = 500
+
+
+def histogram(values, nbins=30, title=None, x_title=None):
+    """Bar figure of pre-computed histogram bins (replaces px.histogram)."""
+    values = pd.to_numeric(pd.Series(values), errors='coerce').dropna().to_numpy()
+    counts, edges = np.histogram(values, bins=nbins)
+    centers = (edges[:-1] + edges[1:]) / 2
+    widths = np.diff(edges)
+
+    fig = go.Figure(go.Bar(
+        x=centers,
+        y=counts,
+        width=widths,
+        customdata=np.column_stack([edges[:-1], edges[1:]]),
+        hovertemplate="%{customdata[0]:,.0f} – %{customdata[1]:,.0f}<br>Count: %{y}<extra></extra>",
+    ))
+    fig.update_layout(title=title, bargap=0, xaxis_title=x_title, yaxis_title="count")
+    return fig
+
+
+def box_stats(df, x, y):
+    """Per-group quartiles and 1.5×IQR whisker fences, computed server-side."""
+    grouped = df[[x, y]].dropna().groupby(x)[y]
+    # Named columns rather than unstacking, so empty input gives an empty table
+    stats = pd.DataFrame({
+        'q1': grouped.quantile(0.25),
+        'median': grouped.quantile(0.5),
+        'q3': grouped.quantile(0.75),
+    })
+
+    iqr = stats['q3'] - stats['q1']
+    lo_limit = (stats['q1'] - 1.5 * iqr).rename('lo_limit')
+    hi_limit = (stats['q3'] + 1.5 * iqr).rename('hi_limit')
+
+    # Whiskers extend to the most extreme observation inside the fences
+    bounded = df[[x, y]].dropna().join(lo_limit, on=x).join(hi_limit, on=x)
+    inside = bounded[(bounded[y] >= bounded['lo_limit']) & (bounded[y] <= bounded['hi_limit'])]
+    stats['lowerfence'] = inside.groupby(x)[y].min()
+    stats['upperfence'] = inside.groupby(x)[y].max()
+
+    outliers = bounded[(bounded[y] < bounded['lo_limit']) | (bounded[y] > bounded['hi_limit'])][[x, y]]
+    return stats.reset_index(), outliers
+
+
+def _cap_outliers(outliers, x, y, limit):
+    # Keep the most extreme points per group so the payload stays bounded
+    if outliers.empty:
+        return outliers
+    distance = (outliers[y] - outliers.groupby(x)[y].transform('median')).abs()
+    rank = distance.groupby(outliers[x]).rank(ascending=False, method='first')
+    return outliers[rank <= limit]
+
+
+def box(df, x, y, title=None, max_outliers=MAX_OUTLIERS_PER_GROUP):
+    """Box figure built from box_stats (replaces px.box)."""
+    stats, outliers = box_stats(df, x, y)
+    outliers = _cap_outliers(outliers, x, y, max_outliers)
+
+    fig = go.Figure()
+    fig.add_trace(go.Box(
+        x=stats[x],
+        q1=stats['q1'],
+        median=stats['median'],
+        q3=stats['q3'],
+        lowerfence=stats['lowerfence'],
+        upperfence=stats['upperfence'],
+        boxpoints=False,
+        name=y,
+    ))
+    fig.add_trace(go.Scatter(
+        x=outliers[x],
+        y=outliers[y],
+        mode='markers',
+        marker=dict(size=4, color='#636EFA'),
+        name='Outliers',
+    ))
+    fig.update_layout(title=title, xaxis_title=x, yaxis_title=y, showlegend=False)
+    return fig
+
+
+def downsample(df, x, y, color=None, max_points=MAX_POINTS_PER_SERIES):
+    """Min/max bucket downsampling of each line series to at most max_points rows."""
+    def _reduce(series):
+        series = series.sort_values(x)
+        n = len(series)
+        if n <= max_points:
+            return series
+
+        # Keep the min and max of each bucket so peaks survive the reduction;
+        # two of the max_points slots are reserved for the endpoints
+        n_buckets = max(1, (max_points - 2) // 2)
+        buckets = np.arange(n) * n_buckets // n
+        values = series[y].to_numpy()
+        order = pd.DataFrame({'bucket': buckets, 'value': values, 'pos': np.arange(n)})
+        keep = np.union1d(
+            order.loc[order.groupby('bucket')['value'].idxmin(), 'pos'],
+            order.loc[order.groupby('bucket')['value'].idxmax(), 'pos'],
+        )
+        keep = np.union1d(keep, [0, n - 1])
+        return series.iloc[keep]
+
+    if df.empty:
+        return df
+    if color is None:
+        return _reduce(df)
+    groups = [_reduce(group) for _, group in df.groupby(color, sort=False)]
+    return pd.concat(groups, ignore_index=True) if groups else df
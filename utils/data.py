@@ -0,0 +1,100 @@
+# utils/data.py
+
+import glob
+import hashlib
+import os
+
+import pandas as pd
+import streamlit as st
+
+# -------------------------------
+# Shared election dataset
+# -------------------------------
+# st.cache_data pickles a fresh copy of the frame for every caller and rerun.
+# These loaders use st.cache_resource instead: one frame per process, shared
+# by every session. With copy-on-write enabled, filtering and column
+# assignment on a derived frame never write through to the shared one, so
+# pages must treat what they receive as read-only and must not add columns
+# to it — derived columns belong in prepare_election_frame(), or in
+# load_election_data() when they should not be persisted to the ingest store.
+
+pd.set_option('mode.copy_on_write', True)
+
+CSV_PATH = 'data/Election_Data.csv'
+
+# Title-cased name columns, derived at load time (not persisted to the ingest
+# store) as categoricals so leaderboards can count integer codes
+NAME_COLUMNS = {'First_Name': 'First_Name_Clean', 'Last_Name': 'Last_Name_Clean'}
+
+# Fields every analytical view needs present
+KEY_FIELDS = ['Year', 'Province_Territory', 'Election_Type', 'Parliament', 'Constituency', 'Votes']
+
+
+def prepare_election_frame(df):
+    """Type-cast raw election rows and add every derived column the pages use."""
+    df.columns = df.columns.str.strip()
+
+    # Parse numeric components of date
+    df['Year'] = pd.to_numeric(df['Year'], errors='coerce')
+    df['Month'] = pd.to_numeric(df['Month'], errors='coerce')
+    df['Day'] = pd.to_numeric(df['Day'], errors='coerce')
+    df['Votes'] = pd.to_numeric(df['Votes'], errors='coerce')
+
+    # Build Date from components
+    df['Date'] = pd.to_datetime(dict(year=df['Year'], month=df['Month'], day=df['Day']), errors='coerce')
+    df['Weekday'] = df['Date'].dt.day_name()
+
+    # Elected flag (case-insensitive, missing results count as not elected)
+    df['Win'] = df['Result'].fillna("Unknown").str.contains("Elected", case=False).astype(int)
+    return df
+
+
+def read_election_csv(path=CSV_PATH):
+    return prepare_election_frame(pd.read_csv(path, encoding='latin1'))
+
+
+def fingerprint(df):
+    """Short content hash of a frame, used to key on-disk artifacts derived from it."""
+    hashed = pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes()
+    return hashlib.sha1(hashed).hexdigest()[:16]
+
+
+def prune_artifacts(directory, prefix, keep):
+    """Delete earlier <prefix>-<key> artifacts in directory once keep has been written."""
+    for path in glob.glob(os.path.join(directory, f"{prefix}-*")):
+        # In-flight .tmp files belong to another writer
+        if path != keep and not path.endswith('.tmp'):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+@st.cache_resource(show_spinner="Loading election data…")
+def load_election_data():
+    from utils import ingest
+
+    # Prefer the partitioned store when it is up to date with the CSV
+    df = ingest.read_partitions() if ingest.partitions_current() else read_election_csv()
+
+    # Normalized candidate names
+    for col, clean in NAME_COLUMNS.items():
+        df[clean] = df[col].str.title().astype('category')
+    return df
+
+
+@st.cache_resource(show_spinner=False)
+def election_view(scope):
+    """Process-wide, read-only frame for a page scope ('home' or 'analytics')."""
+    df = load_election_data()
+    if scope == 'home':
+        # Rows with a complete election date
+        df = df.dropna(subset=['Date'])
+        df['Year'] = df['Date'].dt.year.astype(int)
+    elif scope == 'analytics':
+        # Rows with every key field present
+        df = df.dropna(subset=KEY_FIELDS)
+        df['Votes'] = df['Votes'].astype(int)
+    else:
+        raise ValueError(f"Unknown scope: {scope}")
+    return df
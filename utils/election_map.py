@@ -0,0 +1,139 @@
+# utils/election_map.py
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+import streamlit as st
+
+from utils.data import election_view, fingerprint, prune_artifacts
+
+# -------------------------------
+# Historical election map
+# -------------------------------
+# Builds the Folium time-slider map as a static HTML artifact, keyed by a
+# fingerprint of the election data and ridings file it is drawn from.
+# geopandas and folium are imported only when the map actually has to be
+# (re)built.
+
+RIDINGS_PATH = "data/canada_ridings_latest.geojson"  # Replace this with your full ridings file
+MAP_DIR = "outputs"
+MAP_NAME = "canadian_election_historical_map"
+
+party_colors = {
+    'Liberal Party': '#E41A1C',
+    'Conservative Party': '#377EB8',
+    'New Democratic Party': '#FF7F00',
+    'Bloc Québécois': '#4DAF4A',
+    'Green Party': '#984EA3',
+    'People\'s Party': '#984EA3',
+    'Independent': '#999999',
+    'Unknown': '#CCCCCC'
+}
+
+
+def get_party_color(party):
+    return party_colors.get(party, "#BBBBBB")
+
+
+@st.cache_resource(show_spinner=False)
+def map_fingerprint():
+    """Hash of the election data and ridings file the map is built from."""
+    ridings = hashlib.sha1()
+    if os.path.exists(RIDINGS_PATH):
+        with open(RIDINGS_PATH, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                ridings.update(block)
+    return f"{fingerprint(election_view('analytics'))}-{ridings.hexdigest()[:8]}"
+
+
+def map_path():
+    """Where the map for the current data is (or will be) saved."""
+    return os.path.join(MAP_DIR, f"{MAP_NAME}-{map_fingerprint()}.html")
+
+
+def build_map(output_path):
+    import folium
+    import geopandas as gpd
+    from folium.plugins import TimeSliderChoropleth
+
+    # Downloaded or fetched Canadian riding boundaries (simplified for example)
+    riding_gdf = gpd.read_file(RIDINGS_PATH)
+
+    # Only keep Elected candidates with a known party
+    election_df = election_view('analytics').dropna(subset=['Political_Affiliation'])
+    election_winners = election_df[election_df['Result'].str.strip().str.contains("Elected", na=False)]
+
+    # Normalize riding names and join election results to ridings
+    riding_gdf['Constituency'] = riding_gdf['ENGLISH_NAME'].str.strip().str.lower()
+    election_winners = election_winners.assign(Constituency=election_winners['Constituency'].str.strip().str.lower())
+
+    riding_gdf = riding_gdf.merge(
+        election_winners[['Year', 'Constituency', 'Political_Affiliation', 'Candidate', 'Gender', 'Occupation', 'Votes']],
+        how='left',
+        on='Constituency'
+    )
+    riding_gdf['color'] = riding_gdf['Political_Affiliation'].apply(get_party_color)
+
+    canada_center = [56.1304, -106.3468]
+    m = folium.Map(location=canada_center, zoom_start=4, tiles='CartoDB positron')
+
+    # TimeSlider style per feature and year
+    styledict = {}
+    for idx, row in riding_gdf.iterrows():
+        if pd.isna(row['Year']):
+            continue
+        styledict.setdefault(str(idx), {})[str(int(row['Year']))] = {
+            'color': row['color'],
+            'opacity': 0.7,
+            'fillColor': row['color'],
+            'fillOpacity': 0.6
+        }
+
+    riding_geojson = json.loads(riding_gdf.to_json())
+
+    folium.GeoJson(
+        data=riding_geojson,
+        style_function=lambda x: {
+            'color': 'black',
+            'weight': 0.5,
+            'fillOpacity': 0.1
+        },
+        highlight_function=lambda x: {
+            'weight': 3,
+            'color': 'yellow'
+        },
+        tooltip=folium.features.GeoJsonTooltip(
+            fields=['Constituency'],
+            aliases=['Constituency:']
+        ),
+        popup=folium.GeoJsonPopup(
+            fields=['Constituency', 'Political_Affiliation', 'Candidate', 'Votes', 'Gender', 'Occupation'],
+            aliases=["Riding", "Party", "Candidate", "Votes", "Gender", "Occupation"],
+            labels=True,
+            style="background-color: white;"
+        )
+    ).add_to(m)
+
+    TimeSliderChoropleth(data=riding_geojson, styledict=styledict).add_to(m)
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    m.save(output_path)
+    return output_path
+
+
+def ensure_map():
+    """Path to the map HTML for the current data, building it only when none exists yet."""
+    path = map_path()
+    if os.path.exists(path):
+        return path
+
+    build_map(path + '.tmp')
+    os.replace(path + '.tmp', path)
+    prune_artifacts(MAP_DIR, MAP_NAME, path)
+    return path
+
+
+if __name__ == '__main__':
+    print(f"✅ Map created successfully: {build_map(map_path())}")
@@ -0,0 +1,112 @@
+# utils/explain.py
+
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils import models
+from utils.data import prune_artifacts
+
+# -------------------------------
+# Model explanations
+# -------------------------------
+# Permutation importance and partial dependence for every trained model.
+# Impurity-based importances favour high-cardinality codes like Occupation;
+# permutation importance measures the score drop on held-out rows instead.
+# Label-encoded features are explained per category rather than along a
+# numeric grid of their codes, and reported under their labels. Repeats and
+# features are spread across cores with joblib, rows are subsampled to bound
+# the cost, and results are stored next to the model artifacts keyed by the
+# training data and model parameters.
+
+N_REPEATS = 10
+MAX_ROWS = 2_000
+GRID_RESOLUTION = 20
+MAX_CATEGORIES = 20  # most frequent categories per feature in the sampled rows
+EXPLAIN_VERSION = 2  # bump when the stored explanation format changes
+
+
+def _permutation_importance(model, X, y):
+    from joblib import Parallel, delayed
+    from sklearn.inspection import permutation_importance
+
+    # One repeat per task so repeats, not just features, run in parallel
+    runs = Parallel(n_jobs=-1)(
+        delayed(permutation_importance)(model, X, y, n_repeats=1, random_state=seed)
+        for seed in range(N_REPEATS)
+    )
+    scores = np.hstack([run.importances for run in runs])
+    return pd.DataFrame({
+        'Feature': X.columns,
+        'Importance': scores.mean(axis=1),
+        'Std': scores.std(axis=1),
+    })
+
+
+def _category_dependence(model, X, feature):
+    # Average prediction with every row's feature set to each of its most frequent
+    # codes; the positive-class probability for classifiers, as partial_dependence uses
+    predict = (lambda rows: model.predict_proba(rows)[:, 1]) if hasattr(model, 'predict_proba') else model.predict
+    codes = X[feature].value_counts().index[:MAX_CATEGORIES].to_numpy()
+    return codes, np.array([predict(X.assign(**{feature: code})).mean() for code in codes])
+
+
+def _numeric_dependence(model, X, feature):
+    from sklearn.inspection import partial_dependence
+
+    result = partial_dependence(model, X, [feature], grid_resolution=GRID_RESOLUTION, kind='average')
+    return result['grid_values'][0], result['average'][0]
+
+
+def _partial_dependence(model, X):
+    from joblib import Parallel, delayed
+
+    # Label codes and Year are integers; partial_dependence needs float grids
+    X = X.astype(float)
+    results = Parallel(n_jobs=-1)(
+        delayed(_category_dependence if feature in models.FEATURES else _numeric_dependence)(model, X, feature)
+        for feature in X.columns
+    )
+
+    encoders = models.feature_encoders()
+    frames = []
+    for feature, (values, average) in zip(X.columns, results):
+        if feature in encoders:
+            values = encoders[feature].classes_[values.astype(int)]
+        frames.append(pd.DataFrame({'Feature': feature, 'Value': values, 'Average': average}))
+    return pd.concat(frames, ignore_index=True)
+
+
+def explain_model(model, X, y):
+    """Permutation importance and partial dependence on at most MAX_ROWS sampled rows."""
+    if len(X) > MAX_ROWS:
+        X = X.sample(MAX_ROWS, random_state=0)
+        y = y.loc[X.index]
+    return {
+        'permutation_importance': _permutation_importance(model, X, y),
+        'partial_dependence': _partial_dependence(model, X),
+    }
+
+
+@st.cache_resource(show_spinner="Loading model explanations…")
+def explanations():
+    """Explanations for every trained model, read from disk when already computed for this data."""
+    import joblib
+
+    path = os.path.join(models.MODEL_DIR, f"explanations-{models.artifact_key()}-v{EXPLAIN_VERSION}.joblib")
+    if os.path.exists(path):
+        return joblib.load(path)
+
+    result = {name: explain_model(model, X, y) for name, (model, X, y) in models.evaluation_sets().items()}
+    os.makedirs(models.MODEL_DIR, exist_ok=True)
+    joblib.dump(result, path + '.tmp')
+    os.replace(path + '.tmp', path)
+    prune_artifacts(models.MODEL_DIR, 'explanations', path)
+    return result
+
+
+if __name__ == '__main__':
+    for name in explanations():
+        print(f"✅ Explained {name}")
@@ -0,0 +1,155 @@
+# utils/forecasting.py
+
+import hashlib
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.data import election_view, fingerprint, prune_artifacts
+
+# -------------------------------
+# Per-riding vote-share forecasting
+# -------------------------------
+# Every (riding, party) pair has a short vote-share series, one point per
+# general election. Rather than fitting thousands of tiny models one by one,
+# the series are laid out as rows of a (series × election) matrix and a
+# damped-trend exponential smoothing model is fitted to all rows at once:
+# each smoothing-parameter candidate is evaluated for the whole batch in a
+# single vectorized pass and every row keeps its best candidate. Only inputs
+# large enough to span several batches are spread over worker processes;
+# below that a spawned worker's start-up costs more than the fit itself.
+# Results are cached on disk under a fingerprint of the input series and the
+# model constants, so they are only recomputed when either changes.
+
+FORECAST_DIR = 'outputs/forecasts'
+# Rows per batch. A batch of this size takes a few seconds to fit, which is
+# what a spawned worker needs to earn back its interpreter start-up and imports.
+BATCH_SIZE = 100_000
+MIN_OBSERVATIONS = 3
+
+ALPHAS = [0.2, 0.4, 0.6, 0.8, 1.0]
+BETAS = [0.0, 0.1, 0.3]
+PHI = 0.9  # trend damping per election
+Z_80 = 1.2816  # 80% prediction interval
+
+
+@st.cache_resource(show_spinner=False)
+def vote_share_series():
+    """Long frame of General-election vote share % per Year, Constituency and party."""
+    df = election_view('analytics')
+    df = df[df['Election_Type'] == 'General'].dropna(subset=['Political_Affiliation'])
+
+    votes = df.groupby(['Year', 'Constituency', 'Political_Affiliation'])['Votes'].sum()
+    totals = votes.groupby(level=['Year', 'Constituency']).transform('sum')
+    share = (votes / totals.where(totals > 0) * 100).rename('Vote_Share')
+    return share.dropna().reset_index()
+
+
+def _smooth(Y, alpha, beta):
+    # Damped Holt recursion over the election axis for every row at once.
+    # Missing points (party did not run) leave level and trend untouched.
+    n, T = Y.shape
+    level = np.full(n, np.nan)
+    trend = np.zeros(n)
+    sse = np.zeros(n)
+    errors = np.zeros(n)
+
+    for t in range(T):
+        y = Y[:, t]
+        seen = ~np.isnan(y)
+        started = seen & ~np.isnan(level)
+        first = seen & np.isnan(level)
+
+        pred = level + PHI * trend
+        err = np.where(started, y - pred, 0.0)
+        sse += err ** 2
+        errors += started
+
+        new_level = np.where(started, alpha * y + (1 - alpha) * pred, level)
+        trend = np.where(started, beta * (new_level - level) + (1 - beta) * PHI * trend, trend)
+        level = np.where(first, y, new_level)
+
+    return level, trend, sse, errors
+
+
+def fit_batch(Y):
+    """Best (alpha, beta) per row of Y and its one-step-ahead forecast with spread."""
+    best_sse = np.full(Y.shape[0], np.inf)
+    best = {}
+    for alpha, beta in product(ALPHAS, BETAS):
+        level, trend, sse, errors = _smooth(Y, alpha, beta)
+        better = sse < best_sse
+        best_sse = np.where(better, sse, best_sse)
+        for key, value in [('level', level), ('trend', trend), ('errors', errors),
+                           ('alpha', np.full_like(sse, alpha)), ('beta', np.full_like(sse, beta))]:
+            best[key] = np.where(better, value, best.get(key, value))
+
+    forecast = best['level'] + PHI * best['trend']
+    sigma = np.sqrt(best_sse / np.maximum(best['errors'], 1))
+    return {
+        'Forecast': np.clip(forecast, 0, 100),
+        'Lower': np.clip(forecast - Z_80 * sigma, 0, 100),
+        'Upper': np.clip(forecast + Z_80 * sigma, 0, 100),
+        'alpha': best['alpha'],
+        'beta': best['beta'],
+    }
+
+
+def forecast_all(series, workers=None):
+    """Forecast the next election's vote share for every (Constituency, party) series."""
+    matrix = series.pivot_table(index=['Constituency', 'Political_Affiliation'], columns='Year', values='Vote_Share')
+    matrix = matrix[matrix.notna().sum(axis=1) >= MIN_OBSERVATIONS]
+    Y = matrix.to_numpy(dtype=float)
+
+    batches = [Y[i:i + BATCH_SIZE] for i in range(0, len(Y), BATCH_SIZE)]
+    if len(batches) > 1 and (workers or os.cpu_count() or 1) > 1:
+        # Spawned, not forked: this runs on the warm-up thread inside the threaded
+        # Streamlit server, and a forked child could inherit locks held by other threads
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), mp_context=context) as pool:
+            results = list(pool.map(fit_batch, batches))
+    else:
+        results = [fit_batch(batch) for batch in batches]
+
+    out = pd.DataFrame({key: np.concatenate([r[key] for r in results]) for key in results[0]} if results else {},
+                       index=matrix.index).reset_index()
+
+    observed = matrix.notna().to_numpy()
+    last = observed.shape[1] - 1 - np.argmax(observed[:, ::-1], axis=1)
+    out['Observations'] = observed.sum(axis=1)
+    out['Last_Year'] = matrix.columns.to_numpy()[last]
+    out['Last_Share'] = Y[np.arange(len(Y)), last]
+    return out
+
+
+def _params_key():
+    # Model constants the cached forecasts were computed with
+    params = [ALPHAS, BETAS, PHI, Z_80, MIN_OBSERVATIONS]
+    return hashlib.sha1(json.dumps(params).encode()).hexdigest()[:8]
+
+
+@st.cache_resource(show_spinner="Loading riding forecasts…")
+def riding_forecasts():
+    """Forecasts for the current data and model constants, read from disk when already computed."""
+    series = vote_share_series()
+    path = os.path.join(FORECAST_DIR, f"riding_forecasts-{fingerprint(series)}-{_params_key()}.parquet")
+    if os.path.exists(path):
+        return pd.read_parquet(path)
+
+    forecasts = forecast_all(series)
+    os.makedirs(FORECAST_DIR, exist_ok=True)
+    forecasts.to_parquet(path + '.tmp', index=False)
+    os.replace(path + '.tmp', path)
+    prune_artifacts(FORECAST_DIR, 'riding_forecasts', path)
+    return forecasts
+
+
+if __name__ == '__main__':
+    forecasts = riding_forecasts()
+    print(f"✅ Forecast {len(forecasts):,} riding/party series")
@@ -0,0 +1,288 @@
+# utils/ingest.py
+
+import argparse
+import glob
+import hashlib
+import io
+import json
+import os
+import shutil
+import time
+
+import pandas as pd
+
+from utils.data import CSV_PATH, prepare_election_frame
+
+# -------------------------------
+# Streaming, append-only ingest
+# -------------------------------
+# Election_Data.csv only ever grows at the end. Instead of re-reading it in
+# full, ingest() picks up at the byte offset it stopped at last time, reads
+# the new rows in fixed-size chunks, validates and type-casts each chunk and
+# appends it to Parquet partitions keyed by Year:
+#
+#   data/partitions/rows/Year=2021/part-<run>-<chunk>.parquet
+#
+# Race summaries and yearly rollups are kept per Year as well, and only the
+# years touched by a run are recomputed. A by-election and a general election
+# in the same riding and year are separate races.
+#
+#   python -m utils.ingest           # incremental
+#   python -m utils.ingest --full    # rebuild from scratch
+
+STORE_PATH = 'data/partitions'
+ROWS_DIR = os.path.join(STORE_PATH, 'rows')
+RACES_DIR = os.path.join(STORE_PATH, 'race_summary')
+ROLLUP_DIR = os.path.join(STORE_PATH, 'yearly_rollup')
+MANIFEST_PATH = os.path.join(STORE_PATH, '_manifest.json')
+
+CHUNK_ROWS = 50_000
+# Bumped whenever what the store holds changes shape; an older store is rebuilt
+STORE_VERSION = 2
+# Bytes hashed from the top of the CSV, and from just before the ingested
+# offset, to detect a rewrite (vs. an append)
+HEAD_BYTES = 64 * 1024
+TAIL_BYTES = 64 * 1024
+
+# A race is one election in one riding
+RACE_KEYS = ['Year', 'Election_Type', 'Constituency']
+
+REQUIRED_COLUMNS = ['Year', 'Month', 'Day', 'Province_Territory', 'Election_Type', 'Parliament',
+                    'Constituency', 'Political_Affiliation', 'Result', 'Votes', 'First_Name', 'Last_Name']
+
+
+def _head_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read(HEAD_BYTES)).hexdigest()
+
+
+def _tail_hash(path, offset):
+    # The last ingested bytes, which an append leaves untouched
+    with open(path, 'rb') as f:
+        f.seek(max(0, offset - TAIL_BYTES))
+        return hashlib.sha1(f.read(min(offset, TAIL_BYTES))).hexdigest()
+
+
+def _unchanged(manifest, path, stat):
+    # Same length and mtime as when last ingested, and the same bytes at both ends
+    return (manifest.get('version') == STORE_VERSION
+            and manifest['csv_path'] == path
+            and manifest['offset'] == stat.st_size
+            and manifest.get('csv_mtime') == stat.st_mtime
+            and manifest['head_hash'] == _head_hash(path)
+            and manifest.get('tail_hash') == _tail_hash(path, stat.st_size))
+
+
+def csv_signature(csv_path=CSV_PATH):
+    """Size, mtime and end hashes of the CSV, for other stores built from it to check they are current."""
+    stat = os.stat(csv_path)
+    return {'csv_path': csv_path, 'size': stat.st_size, 'mtime': stat.st_mtime,
+            'head_hash': _head_hash(csv_path), 'tail_hash': _tail_hash(csv_path, stat.st_size)}
+
+
+def _read_manifest():
+    if not os.path.exists(MANIFEST_PATH):
+        return None
+    with open(MANIFEST_PATH) as f:
+        return json.load(f)
+
+
+def _write_manifest(manifest):
+    os.makedirs(STORE_PATH, exist_ok=True)
+    tmp_path = MANIFEST_PATH + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, MANIFEST_PATH)
+
+
+def _write_parquet(df, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def _partition_dir(root, year):
+    return os.path.join(root, f"Year={int(year)}")
+
+
+# -------------------------------
+# Chunk validation
+# -------------------------------
+def validate_chunk(chunk):
+    """Type-cast a raw chunk; return (valid rows, number of rejected rows)."""
+    # Checked before prepare_election_frame(), which indexes these columns itself
+    missing = [col for col in REQUIRED_COLUMNS if col not in chunk.columns.str.strip()]
+    if missing:
+        raise ValueError(f"Election data is missing required columns: {missing}")
+
+    chunk = prepare_election_frame(chunk)
+
+    # Every page scope needs a Year to place the row
+    valid = chunk['Year'].notna() & (chunk['Year'] % 1 == 0)
+    chunk = chunk[valid]
+    chunk['Year'] = chunk['Year'].astype(int)
+    return chunk, int((~valid).sum())
+
+
+class _BoundedReader(io.RawIOBase):
+    # Stops at the size recorded when the run started, so rows appended
+    # mid-run are left for the next run instead of being ingested twice
+    def __init__(self, f, remaining):
+        self.f = f
+        self.remaining = remaining
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        n = self.f.readinto(memoryview(buffer)[:min(len(buffer), self.remaining)])
+        self.remaining -= n
+        return n
+
+
+def _read_new_chunks(path, offset, end, columns):
+    # Resume from the byte offset; the header is only read on a full ingest
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        reader = io.BufferedReader(_BoundedReader(f, end - offset))
+        if offset:
+            yield from pd.read_csv(reader, encoding='latin1', header=None, names=columns, chunksize=CHUNK_ROWS)
+        else:
+            yield from pd.read_csv(reader, encoding='latin1', chunksize=CHUNK_ROWS)
+
+
+# -------------------------------
+# Per-partition aggregates
+# -------------------------------
+def race_summary(rows):
+    """One row per (Year, Election_Type, Constituency) race: winner, runner-up and margin."""
+    ranked = rows.sort_values(RACE_KEYS + ['Votes'], ascending=[True, True, True, False])
+    position = ranked.groupby(RACE_KEYS, sort=False, dropna=False).cumcount()
+    ranked['Runner_Up'] = ranked['Votes'].where(position == 1)
+
+    summary = ranked.groupby(RACE_KEYS, sort=False, dropna=False).agg(
+        Province_Territory=('Province_Territory', 'first'),
+        Candidates=('Votes', 'size'),
+        Total_Votes=('Votes', 'sum'),
+        Winning_Party=('Political_Affiliation', 'first'),
+        Winning_Votes=('Votes', 'first'),
+        Runner_Up_Votes=('Runner_Up', 'max'),
+    )
+    summary['Runner_Up_Votes'] = summary['Runner_Up_Votes'].fillna(0)
+    summary['Margin'] = summary['Winning_Votes'] - summary['Runner_Up_Votes']
+    summary['Margin %'] = summary['Margin'] / summary['Total_Votes'].where(summary['Total_Votes'] > 0) * 100
+    return summary.reset_index()
+
+
+def yearly_rollup(rows):
+    """Turnout-style totals for one Year partition, one row per election type."""
+    return rows.groupby(['Year', 'Election_Type'], dropna=False).agg(
+        Total_Votes=('Votes', 'sum'),
+        Ridings=('Constituency', 'nunique'),
+        Provinces=('Province_Territory', 'nunique'),
+        Parties=('Political_Affiliation', 'nunique'),
+        Candidates=('Votes', 'size'),
+    ).reset_index()
+
+
+def _refresh_aggregates(years):
+    for year in sorted(years):
+        rows = _read_files(sorted(glob.glob(os.path.join(_partition_dir(ROWS_DIR, year), '*.parquet'))))
+        _write_parquet(race_summary(rows), os.path.join(_partition_dir(RACES_DIR, year), 'summary.parquet'))
+        _write_parquet(yearly_rollup(rows), os.path.join(_partition_dir(ROLLUP_DIR, year), 'rollup.parquet'))
+
+
+# -------------------------------
+# Ingest
+# -------------------------------
+def ingest(csv_path=CSV_PATH, full=False):
+    """Append new CSV rows to the partition store; returns a short run report."""
+    started = time.time()
+    manifest = _read_manifest()
+    stat = os.stat(csv_path)
+    size = stat.st_size
+    head = _head_hash(csv_path)
+
+    if manifest and not full and _unchanged(manifest, csv_path, stat):
+        return {'rows': 0, 'rejected': 0, 'years': [], 'seconds': round(time.time() - started, 2)}
+
+    # Anything other than a pure append means starting over. An edit in place
+    # (same size, new mtime) or one touching the ingested tail is caught here;
+    # edits deep in the middle of a file that also grew are not.
+    if manifest and (manifest.get('version') != STORE_VERSION
+                     or manifest['csv_path'] != csv_path or manifest['head_hash'] != head
+                     or manifest['offset'] >= size
+                     or manifest.get('tail_hash') != _tail_hash(csv_path, manifest['offset'])):
+        full = True
+    if full or manifest is None:
+        shutil.rmtree(STORE_PATH, ignore_errors=True)
+        manifest = {'version': STORE_VERSION, 'csv_path': csv_path, 'head_hash': head,
+                    'offset': 0, 'columns': None, 'rows': 0, 'rejected': 0}
+
+    run_id = int(started)
+    touched, rows, rejected = set(), 0, 0
+    for n, chunk in enumerate(_read_new_chunks(csv_path, manifest['offset'], size, manifest['columns'])):
+        if manifest['columns'] is None:
+            manifest['columns'] = list(chunk.columns)
+        chunk, bad = validate_chunk(chunk)
+        rejected += bad
+        rows += len(chunk)
+        for year, part in chunk.groupby('Year'):
+            _write_parquet(part, os.path.join(_partition_dir(ROWS_DIR, year), f"part-{run_id}-{n:05d}.parquet"))
+            touched.add(int(year))
+
+    _refresh_aggregates(touched)
+
+    manifest.update(
+        offset=size,
+        rows=manifest['rows'] + rows,
+        rejected=manifest['rejected'] + rejected,
+        # As of the start of the run; rows appended since are picked up next time
+        csv_mtime=stat.st_mtime,
+        tail_hash=_tail_hash(csv_path, size),
+    )
+    _write_manifest(manifest)
+    return {'rows': rows, 'rejected': rejected, 'years': sorted(touched), 'seconds': round(time.time() - started, 2)}
+
+
+# -------------------------------
+# Readers
+# -------------------------------
+def partitions_current(csv_path=CSV_PATH):
+    """True when the partition store has ingested the CSV exactly as it is on disk."""
+    manifest = _read_manifest()
+    if manifest is None or not os.path.exists(csv_path):
+        return False
+    return _unchanged(manifest, csv_path, os.stat(csv_path))
+
+
+def _read_files(paths):
+    # File by file: all-null columns in small chunks may have been written with a different dtype
+    frames = [pd.read_parquet(path) for path in paths]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def read_partitions(years=None):
+    """Election rows from the store, optionally only the given years."""
+    dirs = [_partition_dir(ROWS_DIR, year) for year in years] if years else glob.glob(os.path.join(ROWS_DIR, 'Year=*'))
+    return _read_files(sorted(path for d in dirs for path in glob.glob(os.path.join(d, '*.parquet'))))
+
+
+def load_race_summaries():
+    return _read_files(sorted(glob.glob(os.path.join(RACES_DIR, 'Year=*', '*.parquet'))))
+
+
+def load_yearly_rollups():
+    return _read_files(sorted(glob.glob(os.path.join(ROLLUP_DIR, 'Year=*', '*.parquet'))))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Ingest Election_Data.csv into the partitioned store.")
+    parser.add_argument('--csv', default=CSV_PATH)
+    parser.add_argument('--full', action='store_true', help="rebuild every partition from scratch")
+    args = parser.parse_args()
+
+    report = ingest(args.csv, full=args.full)
+    print(f"✅ Ingested {report['rows']:,} rows ({report['rejected']:,} rejected) "
+          f"into {len(report['years'])} year partition(s) in {report['seconds']}s")
@@ -0,0 +1,175 @@
+# utils/models.py
+
+import hashlib
+import json
+import os
+
+import streamlit as st
+
+from utils.data import election_view, fingerprint, prune_artifacts
+
+# -------------------------------
+# Election models
+# -------------------------------
+# Feature preparation and model fitting for the Predictive Models page,
+# cached process-wide so fitting happens once (or at warm-up) rather than on
+# every rerun. Fitted models are also saved under MODEL_DIR keyed by the
+# training-data fingerprint, so a restart reloads instead of refitting.
+# Hyperparameters come from the tuning run (utils/tuning.py) when one has
+# been published, otherwise from the defaults below.
+# scikit-learn is imported inside the functions that need it.
+
+FEATURES = ['Province_Territory', 'Political_Affiliation', 'Gender', 'Occupation']
+TARGET_YEAR = 2025
+MODEL_DIR = 'outputs/models'
+
+
+@st.cache_resource(show_spinner=False)
+def feature_encoders():
+    """A LabelEncoder per categorical feature; classes_ maps its codes back to labels."""
+    from sklearn.preprocessing import LabelEncoder
+
+    df = election_view('analytics').dropna(subset=FEATURES)
+    return {col: LabelEncoder().fit(df[col].astype(str)) for col in FEATURES}
+
+
+@st.cache_resource(show_spinner=False)
+def training_data():
+    """Label-encoded features X (Year + FEATURES) with win and vote targets."""
+    encoders = feature_encoders()
+
+    df = election_view('analytics').dropna(subset=FEATURES)
+    for col in FEATURES:
+        df[col] = encoders[col].transform(df[col].astype(str))
+
+    X = df[['Year'] + FEATURES]
+    return X, df['Win'], df['Votes']
+
+
+@st.cache_resource(show_spinner=False)
+def training_fingerprint():
+    """Hash of the encoded training data, keying every artifact derived from these models."""
+    X, y_class, y_reg = training_data()
+    return fingerprint(X.assign(Win=y_class, Votes=y_reg))
+
+
+def model_params(name, defaults):
+    """Defaults overlaid with the published tuned configuration for this model, if any."""
+    from utils.tuning import best_params
+
+    return {**defaults, **best_params().get(name, {}).get('params', {})}
+
+
+def _params_key(params):
+    return hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()[:8]
+
+
+def _artifact(name, fit, params):
+    # Load a fitted model for the current training data and parameters, or fit and save it
+    import joblib
+
+    path = os.path.join(MODEL_DIR, f"{name}-{training_fingerprint()}-{_params_key(params)}.joblib")
+    if os.path.exists(path):
+        return joblib.load(path)
+
+    result = fit(params)
+    os.makedirs(MODEL_DIR, exist_ok=True)
+    joblib.dump(result, path + '.tmp')
+    os.replace(path + '.tmp', path)
+    prune_artifacts(MODEL_DIR, name, path)
+    return result
+
+
+def _fit_logistic(params):
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.model_selection import train_test_split
+
+    X, y_class, _ = training_data()
+    train = X['Year'] < TARGET_YEAR
+    test = X['Year'] == TARGET_YEAR
+    if not train.any():
+        return None
+
+    if test.any():
+        eval_year = TARGET_YEAR
+        X_fit, y_fit, X_eval, y_eval = X[train], y_class[train], X[test], y_class[test]
+    else:
+        # No target-year data: split the latest year into train/test
+        eval_year = X['Year'].max()
+        latest = X['Year'] == eval_year
+        X_fit, X_eval, y_fit, y_eval = train_test_split(X[latest], y_class[latest], test_size=0.3, random_state=42)
+
+    model = LogisticRegression(**params)
+    model.fit(X_fit, y_fit)
+    return {'model': model, 'X_eval': X_eval, 'y_eval': y_eval, 'eval_year': eval_year}
+
+
+def _held_out(X):
+    # Latest-year rows scored in place of TARGET_YEAR; the same split _fit_logistic makes
+    from sklearn.model_selection import train_test_split
+
+    latest = X.index[X['Year'] == X['Year'].max()]
+    _, held_out = train_test_split(latest, test_size=0.3, random_state=42)
+    return held_out
+
+
+def _fit_random_forest(params):
+    from sklearn.ensemble import RandomForestRegressor
+
+    X, _, y_reg = training_data()
+    train = X['Year'] < TARGET_YEAR
+    if not (X['Year'] == TARGET_YEAR).any():
+        # No target-year data: keep the rows it is scored on out of training
+        train &= ~X.index.isin(_held_out(X))
+
+    model = RandomForestRegressor(**params)
+    model.fit(X[train], y_reg[train])
+    return model
+
+
+def _logistic_params():
+    return model_params('logistic_regression', {'max_iter': 1000})
+
+
+def _random_forest_params():
+    return model_params('random_forest', {'n_estimators': 100, 'random_state': 42})
+
+
+@st.cache_resource(show_spinner="Training logistic regression…")
+def logistic_model():
+    """Win/loss classifier scored on TARGET_YEAR, or on a split of the latest year when it has no data."""
+    return _artifact('logistic_regression', _fit_logistic, _logistic_params())
+
+
+@st.cache_resource(show_spinner="Training random forest…")
+def random_forest_model():
+    """Vote-count regressor trained on every year before TARGET_YEAR, less a held-out latest-year split when it has no data."""
+    return _artifact('random_forest', _fit_random_forest, _random_forest_params())
+
+
+def artifact_key():
+    """Training-data fingerprint plus the current model parameters, for artifacts derived from the models."""
+    return f"{training_fingerprint()}-{_params_key([_logistic_params(), _random_forest_params()])}"
+
+
+def evaluation_sets():
+    """Each trained model with the rows it is scored on, keyed by display name."""
+    X, _, y_reg = training_data()
+    sets = {}
+
+    classifier = logistic_model()
+    if classifier is not None:
+        sets['Logistic Regression'] = (classifier['model'], classifier['X_eval'], classifier['y_eval'])
+
+    # Score on TARGET_YEAR when present, otherwise on the latest-year rows held out of training
+    test = X['Year'] == TARGET_YEAR
+    if not test.any():
+        test = X.index.isin(_held_out(X))
+    sets['Random Forest'] = (random_forest_model(), X[test], y_reg[test])
+    return sets
+
+
+def warm():
+    training_data()
+    logistic_model()
+    random_forest_model()
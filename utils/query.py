@@ -0,0 +1,287 @@
+# utils/query.py
+
+import json
+import os
+import sys
+
+import streamlit as st
+
+from utils import ingest
+from utils.data import CSV_PATH, KEY_FIELDS, election_view, read_election_csv
+
+# -------------------------------
+# Query backends
+# -------------------------------
+# The page aggregations can run either in pandas over the in-memory frame
+# (default) or as parameterized SQL against an embedded DuckDB file, which
+# pushes filters down into the scan, runs multithreaded and returns Arrow.
+#
+#   ELECTION_QUERY_BACKEND=duckdb streamlit run app.py
+#
+# Build the database once (and after the CSV changes) with:
+#
+#   python -m utils.query build
+#
+# The database records which CSV it was built from; the backend refuses to
+# serve it once the CSV has changed, rather than serving stale aggregates.
+
+BACKEND = os.environ.get("ELECTION_QUERY_BACKEND", "pandas").lower()
+DB_PATH = os.environ.get("ELECTION_DB_PATH", 'data/election.duckdb')
+
+# Distinct (scope, aggregate, filters) results kept, least recently used evicted first.
+# Page widgets and API query strings can produce any number of combinations.
+MAX_CACHED_AGGREGATES = 256
+
+# Row validity rules matching utils.data.election_view()
+SCOPES = {
+    'home': "Date IS NOT NULL",
+    'analytics': " AND ".join(f"{col} IS NOT NULL" for col in KEY_FIELDS),
+}
+
+
+def _isin(df, col, values):
+    return df if not values else df[df[col].isin(values)]
+
+
+class PandasBackend:
+    def __init__(self, df):
+        self.df = df
+
+    def _filter(self, filters):
+        df = self.df
+        if filters.get('election_type') is not None:
+            df = df[df['Election_Type'] == filters['election_type']]
+        df = _isin(df, 'Province_Territory', filters.get('provinces'))
+        df = _isin(df, 'Political_Affiliation', filters.get('parties'))
+        df = _isin(df, 'Constituency', filters.get('constituencies'))
+        df = _isin(df, 'Year', filters.get('years'))
+        return df
+
+    def turnout(self, filters):
+        return self._filter(filters).groupby('Year').agg({
+            'Votes': 'sum',
+            'Constituency': 'nunique',
+            'Province_Territory': 'nunique'
+        }).rename(columns={
+            'Votes': 'Total Votes',
+            'Constituency': 'Total Ridings',
+            'Province_Territory': 'Provinces Participating'
+        }).reset_index()
+
+    def province_totals(self, filters):
+        return self._filter(filters).groupby(['Year', 'Province_Territory'])['Votes'].sum().reset_index()
+
+    def party_vote_share(self, filters):
+        party_share = self._filter(filters).groupby(['Year', 'Political_Affiliation'])['Votes'].sum().reset_index()
+        total_by_year = party_share.groupby('Year')['Votes'].sum().reset_index().rename(columns={'Votes': 'YearTotal'})
+        party_share = party_share.merge(total_by_year, on='Year')
+        party_share['Vote Share %'] = (party_share['Votes'] / party_share['YearTotal']) * 100
+        return party_share
+
+    def occupation_vote_share(self, filters, limit=15):
+        df = self._filter(filters)
+        share = (df['Votes'] / df.groupby(['Year', 'Constituency'])['Votes'].transform('sum')) * 100
+        return (
+            share.groupby(df['Occupation']).mean().rename('Vote_Share').reset_index()
+            .dropna().sort_values('Vote_Share', ascending=False).head(limit)
+        )
+
+    def riding_winners(self, filters):
+        df = self._filter(filters)
+        keys = ['Parliament', 'Province_Territory', 'Constituency']
+
+        winners = df[df['Result'].str.contains("Elected", na=False)]
+        summary = winners.groupby(keys + ['Political_Affiliation'])['Votes'].sum().reset_index()
+        summary['Rank'] = summary.groupby(keys)['Votes'].rank(ascending=False, method='first')
+        winners_only = summary[summary['Rank'] == 1].drop(columns='Rank')
+
+        total_votes = df.groupby(keys)['Votes'].sum().reset_index().rename(columns={'Votes': 'TotalVotes'})
+        winners_only = winners_only.merge(total_votes, on=keys)
+        winners_only['Vote Share (%)'] = ((winners_only['Votes'] / winners_only['TotalVotes']) * 100).round(2)
+
+        winners_only = winners_only.rename(columns={
+            'Province_Territory': 'Province',
+            'Political_Affiliation': 'Winning Party',
+            'Votes': 'Votes Won'
+        })
+        return winners_only[['Parliament', 'Province', 'Constituency', 'Winning Party', 'Votes Won', 'Vote Share (%)']]
+
+    def occupation_counts(self, filters):
+        df = self._filter(filters)
+        elected = df['Result'].fillna("Unknown").str.contains("Elected", case=False).rename('Result_Clean')
+        return df.groupby([elected, df['Occupation']]).size().reset_index(name='Count')
+
+
+class DuckDBBackend:
+    def __init__(self, path, scope):
+        import duckdb
+
+        self.con = duckdb.connect(path, read_only=True)
+        self.con.execute(f"SET threads TO {os.cpu_count() or 1}")
+        self.scope = SCOPES[scope]
+
+    def built_from(self):
+        """Signature of the CSV the database was built from, or None for a database without one."""
+        import duckdb
+
+        try:
+            row = self.con.execute("SELECT signature FROM source").fetchone()
+        except duckdb.CatalogException:
+            return None
+        return json.loads(row[0]) if row else None
+
+    def _where(self, filters):
+        clauses, params = [self.scope], []
+        if filters.get('election_type') is not None:
+            clauses.append("Election_Type = ?")
+            params.append(filters['election_type'])
+        for col, key in [('Province_Territory', 'provinces'), ('Political_Affiliation', 'parties'),
+                         ('Constituency', 'constituencies'), ('Year', 'years')]:
+            if filters.get(key):
+                clauses.append(f"list_contains(?, {col})")
+                # NumPy scalars from the page widgets are unwrapped for DuckDB's binder
+                params.append([getattr(v, 'item', lambda: v)() for v in filters[key]])
+        return " AND ".join(clauses), params
+
+    def _query(self, sql, filters):
+        where, params = self._where(filters)
+        # Each Streamlit session runs on its own thread; cursors are per-thread connections
+        cursor = self.con.cursor()
+        try:
+            result = cursor.execute(sql.format(where=where), params * sql.count("{where}")).arrow()
+            # DuckDB >= 1.4 returns a RecordBatchReader here, older versions a Table
+            return (result.read_all() if hasattr(result, 'read_all') else result).to_pandas()
+        finally:
+            cursor.close()
+
+    def turnout(self, filters):
+        return self._query("""
+            SELECT Year,
+                   CAST(SUM(Votes) AS BIGINT) AS "Total Votes",
+                   COUNT(DISTINCT Constituency) AS "Total Ridings",
+                   COUNT(DISTINCT Province_Territory) AS "Provinces Participating"
+            FROM elections WHERE {where} AND Year IS NOT NULL
+            GROUP BY Year ORDER BY Year
+        """, filters)
+
+    def province_totals(self, filters):
+        return self._query("""
+            SELECT Year, Province_Territory, CAST(SUM(Votes) AS BIGINT) AS Votes
+            FROM elections WHERE {where} AND Year IS NOT NULL AND Province_Territory IS NOT NULL
+            GROUP BY ALL ORDER BY Year, Province_Territory
+        """, filters)
+
+    def party_vote_share(self, filters):
+        return self._query("""
+            WITH party AS (
+                SELECT Year, Political_Affiliation, CAST(SUM(Votes) AS BIGINT) AS Votes
+                FROM elections WHERE {where} AND Year IS NOT NULL AND Political_Affiliation IS NOT NULL
+                GROUP BY ALL
+            )
+            SELECT *, CAST(SUM(Votes) OVER (PARTITION BY Year) AS BIGINT) AS YearTotal,
+                   Votes / SUM(Votes) OVER (PARTITION BY Year) * 100 AS "Vote Share %"
+            FROM party ORDER BY Year, Political_Affiliation
+        """, filters)
+
+    def occupation_vote_share(self, filters, limit=15):
+        return self._query(f"""
+            WITH shares AS (
+                SELECT Occupation,
+                       Votes / NULLIF(SUM(Votes) OVER (PARTITION BY Year, Constituency), 0) * 100 AS share
+                FROM elections WHERE {{where}}
+            )
+            SELECT Occupation, AVG(share) AS Vote_Share
+            FROM shares WHERE Occupation IS NOT NULL
+            GROUP BY Occupation HAVING AVG(share) IS NOT NULL
+            ORDER BY Vote_Share DESC LIMIT {int(limit)}
+        """, filters)
+
+    def riding_winners(self, filters):
+        return self._query("""
+            WITH won AS (
+                SELECT Parliament, Province_Territory, Constituency, Political_Affiliation,
+                       -- The home scope keeps missing votes, so pandas sums them as floats
+                       CAST(SUM(Votes) AS DOUBLE) AS Votes
+                FROM elections
+                WHERE {where} AND contains(Result, 'Elected')
+                  AND Parliament IS NOT NULL AND Province_Territory IS NOT NULL
+                  AND Constituency IS NOT NULL AND Political_Affiliation IS NOT NULL
+                GROUP BY Parliament, Province_Territory, Constituency, Political_Affiliation
+                QUALIFY row_number() OVER (PARTITION BY Parliament, Province_Territory, Constituency ORDER BY SUM(Votes) DESC) = 1
+            ),
+            totals AS (
+                SELECT Parliament, Province_Territory, Constituency, CAST(SUM(Votes) AS DOUBLE) AS TotalVotes
+                FROM elections WHERE {where}
+                GROUP BY ALL
+            )
+            SELECT Parliament,
+                   Province_Territory AS Province,
+                   Constituency,
+                   Political_Affiliation AS "Winning Party",
+                   Votes AS "Votes Won",
+                   round(Votes / TotalVotes * 100, 2) AS "Vote Share (%)"
+            FROM won JOIN totals USING (Parliament, Province_Territory, Constituency)
+            ORDER BY Parliament, Province, Constituency
+        """, filters)
+
+    def occupation_counts(self, filters):
+        return self._query("""
+            SELECT coalesce(Result, 'Unknown') ILIKE '%elected%' AS Result_Clean, Occupation, COUNT(*) AS Count
+            FROM elections WHERE {where} AND Occupation IS NOT NULL
+            GROUP BY ALL ORDER BY Result_Clean, Occupation
+        """, filters)
+
+
+@st.cache_resource(show_spinner=False)
+def _duckdb_backend(path, scope):
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"{path} not found. Build it with: python -m utils.query build")
+    backend = DuckDBBackend(path, scope)
+    built_from = backend.built_from()
+    if built_from is None or built_from != ingest.csv_signature(built_from['csv_path']):
+        raise RuntimeError(f"{path} is out of date with the election CSV. Rebuild it with: python -m utils.query build")
+    return backend
+
+
+def get_backend(scope):
+    """Return the configured backend for a page scope; only the pandas path loads the frame."""
+    if BACKEND == 'duckdb':
+        return _duckdb_backend(DB_PATH, scope)
+    return PandasBackend(election_view(scope))
+
+
+@st.cache_data(show_spinner=False, max_entries=MAX_CACHED_AGGREGATES)
+def aggregate(scope, name, filters, **kwargs):
+    """Cached backend aggregate, shared by every session asking with the same filters."""
+    backend = get_backend(scope)
+    return getattr(backend, name)(filters, **kwargs)
+
+
+# -------------------------------
+# Database build
+# -------------------------------
+def build_database(csv_path=CSV_PATH, db_path=DB_PATH):
+    import duckdb
+
+    # Taken before reading, so rows appended mid-build make the database stale, not silently current
+    signature = ingest.csv_signature(csv_path)
+    df = read_election_csv(csv_path)
+    for col in ['Year', 'Month', 'Day', 'Votes']:
+        df[col] = df[col].astype('Int64')
+
+    tmp_path = db_path + '.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    con = duckdb.connect(tmp_path)
+    # Sorted by Year so row-group min/max statistics prune year filters
+    con.execute("CREATE TABLE elections AS SELECT * FROM df ORDER BY Year")
+    con.execute("CREATE TABLE source AS SELECT ? AS signature", [json.dumps(signature)])
+    con.close()
+    os.replace(tmp_path, db_path)
+    return db_path
+
+
+if __name__ == '__main__':
+    if sys.argv[1:] != ['build']:
+        sys.exit("usage: python -m utils.query build")
+    print(f"✅ Database written: {build_database()}")
@@ -0,0 +1,135 @@
+# utils/spectrum.py
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+# -------------------------------
+# Party spectrum animation
+# -------------------------------
+# Party positions live in SPECTRUM_PATH, one row per (Year, Party). Every
+# year, plus optional interpolated frames between consecutive elections, is
+# baked into a single Plotly animation figure. Playing and scrubbing happen
+# in the browser, so changing the year never reruns the page.
+
+SPECTRUM_PATH = 'data/party_spectrum.csv'
+
+PARTY_COLORS = {
+    'Liberal Party': 'red',
+    'Conservative Party': 'blue',
+    'New Democratic Party': 'orange',
+    'Green Party': 'green',
+    'Bloc Québécois': 'darkgreen',
+    'People\'s Party': 'purple'
+}
+
+AXIS_LABELS = {
+    'Economic': 'Economic Axis: Left ← → Right',
+    'Social': 'Social Axis: Libertarian ↑  |  ↓ Authoritarian'
+}
+
+
+@st.cache_data(show_spinner=False)
+def load_spectrum():
+    """Ideological coordinates per Year and Party."""
+    return pd.read_csv(SPECTRUM_PATH, encoding='utf-8')
+
+
+def animation_frames(df, steps=0):
+    """Positions per frame, with `steps` interpolated frames between elections.
+
+    Every frame carries every party (NaN where it did not exist yet) so the
+    traces line up across frames. A party only moves between two elections
+    it took part in; otherwise it appears at the next election.
+    """
+    grid = df.pivot(index='Year', columns='Party', values=['Economic', 'Social'])
+    years = grid.index.to_numpy()
+
+    frames = []
+    for i, year in enumerate(years):
+        frames.append((str(year), grid.loc[year]))
+        if i + 1 == len(years):
+            break
+        start, end = grid.loc[year], grid.loc[years[i + 1]]
+        for step in range(1, steps + 1):
+            t = step / (steps + 1)
+            # NaN on either side stays NaN, so parties never fade in mid-way
+            frames.append((f"{year + t * (years[i + 1] - year):.1f}", start + t * (end - start)))
+
+    # dict order is frame order, which is the order the slider plays them in
+    return pd.concat({label: positions.unstack(level=0) for label, positions in frames},
+                     names=['Frame', 'Party']).reset_index()
+
+
+@st.cache_data(show_spinner=False)
+def spectrum_animation(steps=0, frame_ms=800):
+    """Animated scatter of every party's position, opening on the latest election."""
+    frames = animation_frames(load_spectrum(), steps)
+
+    fig = px.scatter(
+        frames,
+        x='Economic',
+        y='Social',
+        text='Party',
+        color='Party',
+        color_discrete_map=PARTY_COLORS,
+        animation_frame='Frame',
+        animation_group='Party',
+        title="Political Spectrum by Election Year",
+        labels=AXIS_LABELS,
+        range_x=[-1, 1],
+        range_y=[-1, 1],
+        height=600
+    )
+
+    fig.update_traces(marker=dict(size=14), textposition='top center')
+    for frame in fig.frames:
+        for trace in frame.data:
+            trace.update(marker=dict(size=14), textposition='top center')
+    fig.update_layout(
+        xaxis=dict(showgrid=True, zeroline=True, zerolinewidth=2),
+        yaxis=dict(showgrid=True, zeroline=True, zerolinewidth=2),
+        showlegend=False
+    )
+
+    # Interpolated frames play faster so each election-to-election move takes about frame_ms
+    duration = max(frame_ms // (steps + 1), 20)
+    play = fig.layout.updatemenus[0].buttons[0].args[1]
+    play['frame']['duration'] = duration
+    play['transition']['duration'] = duration
+    fig.layout.sliders[0].transition.duration = 0
+    fig.layout.sliders[0].currentvalue.prefix = 'Year: '
+
+    # Open on the most recent election rather than the first
+    fig.update(data=fig.frames[-1].data)
+    fig.layout.sliders[0].active = len(fig.frames) - 1
+    return fig
+
+
+def _luminance(rgba):
+    # WCAG relative luminance, as Styler.background_gradient uses to pick the text colour
+    r, g, b = (x / 12.92 if x <= 0.04045 else ((x + 0.055) / 1.055) ** 2.4 for x in rgba[:3])
+    return 0.2126 * r + 0.7152 * g + 0.0722 * b
+
+
+@st.cache_data(show_spinner=False)
+def heatmap_cells(values):
+    """Party × Year pivot of one axis and the CSS for each cell's gradient colour."""
+    from matplotlib import colormaps, colors
+
+    pivot = load_spectrum().pivot(index='Party', columns='Year', values=values)
+    cmap, norm = colormaps['RdYlGn'], colors.Normalize(vmin=-1, vmax=1)
+
+    def css(value):
+        # NaN maps to the colormap's "bad" colour, as it does in background_gradient
+        rgba = cmap(norm(value))
+        text = '#f1f1f1' if _luminance(rgba) < 0.408 else '#000000'
+        return f"background-color: {colors.rgb2hex(rgba)};color: {text};"
+
+    return pivot, pivot.map(css)
+
+
+def spectrum_heatmap(values):
+    """A fresh Styler over the cached pivot and colours; applying them is a lookup."""
+    pivot, cells = heatmap_cells(values)
+    return pivot.style.apply(lambda _: cells, axis=None).format("{:.2f}")
@@ -0,0 +1,129 @@
+# utils/tables.py
+
+import io
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# -------------------------------
+# Paginated server-side tables
+# -------------------------------
+# st.dataframe serializes every row to the browser on each rerun. paged_table
+# keeps the frame on the server and only ships one page, with sort and search
+# answered from cached per-column sort orders.
+
+DEFAULT_PAGE_SIZE = 100
+CSV_CHUNK_ROWS = 50_000
+NO_SORT = "(original order)"
+
+# Cached index arrays / download bytes per distinct table, least recently used evicted first
+MAX_CACHED_TABLES = 32
+MAX_CACHED_DOWNLOADS = 4
+
+
+@st.cache_data(show_spinner=False, max_entries=MAX_CACHED_TABLES)
+def _sort_orders(df):
+    # Stable argsort per column, nulls last; reversed for descending at lookup time
+    orders = {}
+    for col in df.columns:
+        missing = df[col].isna().to_numpy()
+        valid = np.flatnonzero(~missing)
+        values = df[col].to_numpy()[valid]
+        try:
+            order = valid[np.argsort(values, kind='stable')]
+        except TypeError:
+            # Mixed-type object columns: fall back to sorting on the string form
+            order = valid[np.argsort(values.astype(str), kind='stable')]
+        orders[col] = np.concatenate([order, np.flatnonzero(missing)])
+    return orders
+
+
+@st.cache_data(show_spinner=False, max_entries=MAX_CACHED_TABLES)
+def _search_text(df):
+    # One lowercase haystack per row across all text columns, built once
+    text_cols = df.select_dtypes(include=['object', 'string', 'category']).columns
+    if len(text_cols) == 0:
+        return pd.Series('', index=range(len(df)))
+    haystack = df[text_cols[0]].astype(str)
+    for col in text_cols[1:]:
+        haystack = haystack + '\u0001' + df[col].astype(str)
+    return haystack.str.lower().reset_index(drop=True)
+
+
+def _positions(df, sort_by, ascending, query):
+    if sort_by == NO_SORT:
+        order = np.arange(len(df))
+    else:
+        order = _sort_orders(df)[sort_by]
+        if not ascending:
+            # Keep nulls at the end when flipping the order
+            nulls = int(df[sort_by].isna().sum())
+            order = np.concatenate([order[:len(order) - nulls][::-1], order[len(order) - nulls:]])
+
+    if query:
+        mask = _search_text(df).str.contains(query.lower(), regex=False).to_numpy()
+        order = order[mask[order]]
+    return order
+
+
+@st.cache_data(show_spinner=False, max_entries=MAX_CACHED_DOWNLOADS)
+def _to_csv(df):
+    # Write in chunks so the intermediate string buffers stay small
+    buffer = io.BytesIO()
+    for start in range(0, len(df), CSV_CHUNK_ROWS):
+        chunk = df.iloc[start:start + CSV_CHUNK_ROWS]
+        buffer.write(chunk.to_csv(index=False, header=(start == 0)).encode('utf-8'))
+    if len(df) == 0:
+        buffer.write(df.to_csv(index=False).encode('utf-8'))
+    return buffer.getvalue()
+
+
+@st.cache_data(show_spinner=False, max_entries=MAX_CACHED_DOWNLOADS)
+def _to_parquet(df):
+    buffer = io.BytesIO()
+    df.to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+
+def _parquet_available():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def paged_table(df, key, page_size=DEFAULT_PAGE_SIZE, default_sort=None, ascending=True):
+    """Render df one page at a time with server-side sort, search and full-result download."""
+    df = df.reset_index(drop=True)
+    columns = [NO_SORT] + list(df.columns)
+
+    c1, c2, c3 = st.columns([3, 2, 1])
+    query = c1.text_input("Search", key=f"{key}_search", placeholder="Filter rows containing…")
+    sort_by = c2.selectbox("Sort by", columns, index=columns.index(default_sort) if default_sort in columns else 0, key=f"{key}_sort")
+    ascending = c3.radio("Order", ["Asc", "Desc"], index=0 if ascending else 1, key=f"{key}_order", horizontal=True) == "Asc"
+
+    positions = _positions(df, sort_by, ascending, query.strip())
+    total = len(positions)
+    pages = max(1, -(-total // page_size))
+
+    # Clamp a stale page number (e.g. after a narrower search) before the widget renders.
+    # The widget takes no value= since its state is set here; it starts at min_value.
+    if st.session_state.get(f"{key}_page", 1) > pages:
+        st.session_state[f"{key}_page"] = pages
+
+    page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, step=1, key=f"{key}_page")
+    start = (int(page) - 1) * page_size
+    end = min(start + page_size, total)
+
+    st.dataframe(df.iloc[positions[start:end]], use_container_width=True, hide_index=True)
+    st.caption(f"Showing rows {start + 1 if total else 0:,}–{end:,} of {total:,}.")
+
+    # Serialize the full filtered result only when asked for
+    if st.checkbox("Prepare full download", key=f"{key}_download"):
+        result = df.iloc[positions]
+        d1, d2 = st.columns(2)
+        d1.download_button("⬇️ CSV", _to_csv(result), file_name=f"{key}.csv", mime="text/csv", key=f"{key}_csv")
+        if _parquet_available():
+            d2.download_button("⬇️ Parquet", _to_parquet(result), file_name=f"{key}.parquet", mime="application/octet-stream", key=f"{key}_parquet")
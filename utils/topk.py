@@ -0,0 +1,84 @@
+# utils/topk.py
+
+import numpy as np
+import pandas as pd
+
+# -------------------------------
+# Top-k leaderboards
+# -------------------------------
+# Leaderboards only need the k best rows, not a full ordering. These helpers
+# select them with partial selection: np.argpartition for a single ranking,
+# and k rounds of a segmented max (np.maximum.reduceat) over rows bucketed
+# by integer group code for per-group rankings. Ties keep the earlier row.
+
+
+def top_k(values, k):
+    """Positions of the k largest values, largest first."""
+    values = np.asarray(values, dtype=float)
+    values = np.where(np.isnan(values), -np.inf, values)
+    if k <= 0:
+        return np.array([], dtype=int)
+    if k < len(values):
+        # argpartition finds the k-th largest value but picks arbitrarily among rows
+        # tied with it, so take everything above it and the earliest tied rows
+        kth = values[np.argpartition(-values, k - 1)[k - 1]]
+        above = np.flatnonzero(values > kth)
+        tied = np.flatnonzero(values == kth)[:k - len(above)]
+        candidates = np.sort(np.concatenate([above, tied]))
+    else:
+        candidates = np.arange(len(values))
+    return candidates[np.argsort(-values[candidates], kind='stable')]
+
+
+def top_k_per_group(codes, values, k):
+    """Positions of the k largest values within each integer group code, ordered by group then rank."""
+    codes = np.asarray(codes)
+    values = np.asarray(values, dtype=float)
+    values = np.where(np.isnan(values), -np.inf, values)
+    if len(codes) == 0:
+        return np.array([], dtype=int)
+
+    # Bucket rows by group (stable, so ties resolve to the earlier row)
+    order = np.argsort(codes, kind='stable')
+    bucketed = values[order].copy()
+    grouped = codes[order]
+    starts = np.flatnonzero(np.r_[True, grouped[1:] != grouped[:-1]])
+    sizes = np.diff(np.r_[starts, len(grouped)])
+    segment = np.repeat(np.arange(len(starts)), sizes)
+
+    picks, ranks = [], []
+    for rank in range(k):
+        best = np.maximum.reduceat(bucketed, starts)
+        hits = np.flatnonzero((bucketed == best[segment]) & (best[segment] > -np.inf))
+        if len(hits) == 0:
+            break
+        # First hit in each segment
+        first = hits[np.r_[True, segment[hits][1:] != segment[hits][:-1]]]
+        picks.append(first)
+        ranks.append(np.full(len(first), rank))
+        bucketed[first] = -np.inf
+
+    if not picks:
+        return np.array([], dtype=int)
+    picks, ranks = np.concatenate(picks), np.concatenate(ranks)
+    # Segments are already in group order, so (segment, rank) is the output order
+    return order[picks[np.lexsort((ranks, segment[picks]))]]
+
+
+def top_rows(df, value_col, k, group_col=None):
+    """Rows of df with the k largest value_col, overall or within each group_col value."""
+    if group_col is None:
+        return df.iloc[top_k(df[value_col].to_numpy(), k)]
+    codes, _ = pd.factorize(df[group_col], sort=True)
+    # Rows with a missing group (code -1) are never selected, as in groupby
+    values = np.where(codes >= 0, df[value_col].to_numpy(dtype=float), -np.inf)
+    return df.iloc[top_k_per_group(codes, values, k)]
+
+
+def top_categories(series, k):
+    """The k most frequent values of a categorical Series with their counts."""
+    codes = series.cat.codes.to_numpy()
+    counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+    best = top_k(counts, k)
+    best = best[counts[best] > 0]
+    return pd.DataFrame({series.name: series.cat.categories[best], 'Count': counts[best]})
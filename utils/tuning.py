@@ -0,0 +1,188 @@
+# utils/tuning.py
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from utils import models
+
+# -------------------------------
+# Offline hyperparameter search
+# -------------------------------
+# Successive-halving random search for the page's models, run outside
+# Streamlit:
+#
+#   python -m utils.tuning                     # all models, resuming
+#   python -m utils.tuning --models random_forest --fresh
+#
+# Candidates are scored on time-aware folds (train on earlier elections,
+# validate on the next one), never on random splits that leak future
+# results. Each finished search is checkpointed so an interrupted run picks
+# up at the next model, and the best configurations are published to
+# BEST_PARAMS_PATH, which utils/models.py reads when fitting.
+
+TUNING_DIR = 'outputs/tuning'
+CHECKPOINT_PATH = os.path.join(TUNING_DIR, 'checkpoint.json')
+BEST_PARAMS_PATH = os.path.join(TUNING_DIR, 'best_params.json')
+
+N_FOLDS = 3
+N_CANDIDATES = 64
+
+
+def _search_spaces():
+    from scipy.stats import loguniform, randint, uniform
+
+    return {
+        'logistic_regression': {
+            'target': 'Win',
+            'scoring': 'accuracy',
+            'resource': 'n_samples',
+            'params': {
+                'C': loguniform(1e-3, 1e2),
+                'class_weight': [None, 'balanced'],
+            },
+        },
+        'random_forest': {
+            'target': 'Votes',
+            'scoring': 'r2',
+            'resource': 'n_estimators',
+            'params': {
+                'max_depth': [None, 8, 16, 32],
+                'min_samples_leaf': randint(1, 20),
+                'max_features': [1.0, 'sqrt', 0.5],
+            },
+        },
+        'xgboost': {
+            'target': 'Votes',
+            'scoring': 'r2',
+            'resource': 'n_estimators',
+            'params': {
+                'max_depth': randint(3, 10),
+                'learning_rate': loguniform(1e-2, 3e-1),
+                'subsample': uniform(0.6, 0.4),
+                'colsample_bytree': uniform(0.6, 0.4),
+                'min_child_weight': randint(1, 10),
+            },
+        },
+    }
+
+
+def _estimator(name):
+    if name == 'logistic_regression':
+        from sklearn.linear_model import LogisticRegression
+        return LogisticRegression(max_iter=1000)
+    if name == 'random_forest':
+        from sklearn.ensemble import RandomForestRegressor
+        return RandomForestRegressor(random_state=42)
+    if name == 'xgboost':
+        from xgboost import XGBRegressor
+        return XGBRegressor(random_state=42, n_jobs=1)
+    raise ValueError(f"Unknown model: {name}")
+
+
+def time_splits(years, n_folds=N_FOLDS):
+    """Expanding-window folds: train on every election before year Y, validate on Y."""
+    years = np.asarray(years)
+    folds = []
+    for year in np.unique(years)[-n_folds:]:
+        train, test = np.flatnonzero(years < year), np.flatnonzero(years == year)
+        if len(train) and len(test):
+            folds.append((train, test))
+    return folds
+
+
+def tune(name, X, y, n_candidates=N_CANDIDATES):
+    """Successive-halving random search for one model on time-aware folds."""
+    from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+    from sklearn.model_selection import HalvingRandomSearchCV
+
+    space = _search_spaces()[name]
+    resource = space['resource']
+    search = HalvingRandomSearchCV(
+        _estimator(name),
+        space['params'],
+        n_candidates=n_candidates,
+        factor=3,
+        resource=resource,
+        # Tree models grow forests; the linear model sees more rows each round
+        min_resources=25 if resource == 'n_estimators' else 'exhaust',
+        max_resources=400 if resource == 'n_estimators' else 'auto',
+        scoring=space['scoring'],
+        cv=time_splits(X['Year']),
+        n_jobs=-1,
+        random_state=42,
+        refit=False,
+    )
+    search.fit(X, y)
+
+    # Plain Python values so the configuration round-trips through JSON
+    params = {key: getattr(value, 'item', lambda: value)() for key, value in search.best_params_.items()}
+    if resource == 'n_estimators':
+        params['n_estimators'] = int(search.cv_results_['n_resources'][search.best_index_])
+    return {'params': params, 'score': float(search.best_score_), 'scoring': space['scoring']}
+
+
+def _read_json(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_json(data, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(data, f, indent=2, default=str)
+    os.replace(path + '.tmp', path)
+
+
+def run(names=None, fresh=False, n_candidates=N_CANDIDATES):
+    X, y_class, y_reg = models.training_data()
+    train = X['Year'] < models.TARGET_YEAR
+    targets = {'Win': y_class[train], 'Votes': y_reg[train]}
+    X = X[train]
+
+    fingerprint = models.training_fingerprint()
+    checkpoint = {} if fresh else _read_json(CHECKPOINT_PATH)
+    if checkpoint.get('fingerprint') != fingerprint:
+        checkpoint = {'fingerprint': fingerprint, 'models': {}}
+
+    spaces = _search_spaces()
+    for name in names or list(spaces):
+        if name in checkpoint['models']:
+            print(f"↩️  {name}: already tuned for this data, skipping")
+            continue
+        try:
+            _estimator(name)
+        except ImportError as e:
+            print(f"⚠️  {name}: skipped ({e})")
+            continue
+
+        started = time.time()
+        result = tune(name, X, targets[spaces[name]['target']], n_candidates=n_candidates)
+        result['seconds'] = round(time.time() - started, 1)
+        checkpoint['models'][name] = result
+        _write_json(checkpoint, CHECKPOINT_PATH)
+        print(f"✅ {name}: {result['scoring']}={result['score']:.4f} in {result['seconds']}s {result['params']}")
+
+    _write_json(checkpoint, BEST_PARAMS_PATH)
+    return checkpoint
+
+
+def best_params():
+    """Published configurations ({model: {'params', 'score', 'scoring'}}), empty when none."""
+    return _read_json(BEST_PARAMS_PATH).get('models', {})
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Tune the election models with successive halving.")
+    parser.add_argument('--models', nargs='+', choices=['logistic_regression', 'random_forest', 'xgboost'])
+    parser.add_argument('--fresh', action='store_true', help="ignore the checkpoint and start over")
+    parser.add_argument('--candidates', type=int, default=N_CANDIDATES)
+    args = parser.parse_args()
+
+    run(args.models, fresh=args.fresh, n_candidates=args.candidates)
+    print(f"📄 Best configurations published to {BEST_PARAMS_PATH}")
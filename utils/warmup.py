@@ -0,0 +1,121 @@
+# utils/warmup.py
+
+import threading
+import time
+import traceback
+
+import streamlit as st
+
+# -------------------------------
+# Background cache warm-up
+# -------------------------------
+# The first visitor after a deploy would otherwise pay for the CSV parse,
+# the default aggregates, model fitting and the map build. start() kicks
+# these off once per server process on a daemon thread; app.py shows the
+# progress. Heavy modules are imported by the steps themselves, not here.
+#
+#   python -m utils.warmup    # build the on-disk artifacts (map) before deploy
+
+
+def _load_data():
+    from utils.data import election_view
+
+    election_view('home')
+    election_view('analytics')
+
+
+def _aggregates():
+    from utils import query
+    from utils.data import election_view
+
+    home = dict(provinces=[], parties=[], years=[])
+    for name in ['riding_winners', 'occupation_counts']:
+        query.aggregate('home', name, home)
+
+    # Mirrors the Advanced Analytics page's default selections
+    df = election_view('analytics')
+    types = sorted(df['Election_Type'].dropna().unique())
+    analytics = dict(
+        election_type='General' if 'General' in types else types[0],
+        parties=sorted(df['Political_Affiliation'].dropna().unique()),
+        constituencies=sorted(df['Constituency'].dropna().unique()),
+    )
+    for name in ['turnout', 'province_totals', 'party_vote_share']:
+        query.aggregate('analytics', name, analytics)
+    query.aggregate('analytics', 'occupation_vote_share', analytics, limit=15)
+
+
+def _models():
+    from utils import models
+
+    models.warm()
+
+
+def _explanations():
+    from utils import explain
+
+    explain.explanations()
+
+
+def _forecasts():
+    from utils import forecasting
+
+    forecasting.riding_forecasts()
+
+
+def _map():
+    from utils.election_map import ensure_map
+
+    ensure_map()
+
+
+STEPS = [
+    ("Election data", _load_data),
+    ("Default aggregates", _aggregates),
+    ("Predictive models", _models),
+    ("Model explanations", _explanations),
+    ("Riding forecasts", _forecasts),
+    ("Election map", _map),
+]
+
+
+class WarmupStatus:
+    def __init__(self):
+        self.started = time.time()
+        self.finished = None
+        self.current = None
+        self.done = []
+        self.failed = {}
+
+    @property
+    def ready(self):
+        return self.finished is not None
+
+    def run(self, steps=STEPS):
+        for label, step in steps:
+            self.current = label
+            try:
+                step()
+                self.done.append(label)
+            except Exception:
+                # A missing optional input (e.g. the ridings file) must not block the other steps
+                self.failed[label] = traceback.format_exc(limit=1)
+        self.current = None
+        self.finished = time.time()
+
+
+@st.cache_resource(show_spinner=False)
+def start():
+    """Start the warm-up thread once per process and return its live status."""
+    status = WarmupStatus()
+    threading.Thread(target=status.run, name="cache-warmup", daemon=True).start()
+    return status
+
+
+if __name__ == '__main__':
+    status = WarmupStatus()
+    status.run([("Election map", _map)])
+    for label in status.done:
+        print(f"✅ {label}")
+    for label, error in status.failed.items():
+        print(f"❌ {label}: {error}")